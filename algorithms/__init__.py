@@ -3,9 +3,36 @@ class Algorithm(object):
 
     def __init__(self, problem):
         self.problem = problem
+        self.stop_condition = None
+
+    def should_stop(self):
+        return self.stop_condition is not None and self.stop_condition()
 
     def deploy_components(self):
         raise NotImplementedError
 
     def deploy_routes(self):
         raise NotImplementedError
+
+    def deploy_service_chain(self, service_chain, link_demands):
+        raise NotImplementedError
+
+    def reoptimize(self, iterations):
+        return None
+
+    def add_service_chain(self, service_chain, link_demands, reoptimize=0):
+        self.problem.grid.add_service_chain(service_chain, link_demands)
+        unplaced_components, empty_demands = self.deploy_service_chain(service_chain, link_demands)
+
+        if reoptimize > 0:
+            self.reoptimize(reoptimize)
+
+        return unplaced_components, empty_demands
+
+    def remove_service_chain(self, service_chain, reoptimize=0):
+        components, link_demands = self.problem.grid.remove_service_chain(service_chain)
+
+        if reoptimize > 0:
+            self.reoptimize(reoptimize)
+
+        return components, link_demands
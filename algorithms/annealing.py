@@ -0,0 +1,244 @@
+from algorithms import Algorithm
+from algorithms.greedy import GreedyHeuristic
+from core.entities import Server
+import numpy as np
+import random
+import math
+
+
+class SimulatedAnnealing(Algorithm):
+
+    def __init__(self, problem, iterations=20000, initial_temperature=10.0, cooling_rate=0.9995,
+                 min_temperature=0.01, restarts=20, tournament_size=3):
+        super(SimulatedAnnealing, self).__init__(problem)
+        assert 0 < cooling_rate < 1, 'Cooling rate should be between 0 and 1.'
+        assert restarts > 0, 'At least one greedy restart is needed for the starting solution.'
+        assert tournament_size > 0, 'Tournament size should be positive.'
+
+        self.iterations = iterations
+        self.restarts = restarts
+        self.tournament_size = tournament_size
+        self.initial_temperature = initial_temperature
+        self.cooling_rate = cooling_rate
+        self.min_temperature = min_temperature
+
+        self.greedy = GreedyHeuristic(problem)
+        self.moves = [
+            self.relocate_component, self.swap_components, self.reroute_demand, self.empty_server, self.colocate_demand
+        ]
+
+        self.best_cost = None
+        self.accepted_moves = 0
+
+    def deploy_components(self):
+        grid = self.problem.grid
+        best_cost, best_solution = None, None
+
+        for restart in range(self.restarts):
+            if restart > 0:
+                if self.should_stop():
+                    break
+                grid.reset()
+
+            self.greedy.deploy_components()
+            self.greedy.deploy_routes()
+
+            cost = (self.problem.constraint_service.violation_count(), grid.ledger.total_power())
+            if best_cost is None or cost < best_cost:
+                best_cost, best_solution = cost, grid.dump_solution()
+
+        grid.load_solution(*best_solution)
+
+    def deploy_routes(self):
+        self.improve()
+
+    def deploy_service_chain(self, service_chain, link_demands):
+        return self.greedy.deploy_service_chain(service_chain, link_demands)
+
+    def reoptimize(self, iterations):
+        return self.improve(iterations)
+
+    def improve(self, iterations=None):
+        grid = self.problem.grid
+        cost = grid.ledger.total_power()
+        self.best_cost, best_solution = cost, grid.dump_solution()
+        temperature = self.initial_temperature
+
+        for i in range(self.iterations if iterations is None else iterations):
+            if self.should_stop():
+                break
+
+            move = random.choice(self.moves)
+            grid.checkpoint()
+
+            if not move():
+                grid.rollback()
+                continue
+
+            delta = grid.ledger.total_power() - cost
+            if delta <= 0 or random.random() < math.exp(-delta / temperature):
+                grid.commit()
+                cost += delta
+                self.accepted_moves += 1
+
+                if cost < self.best_cost - 1e-9:
+                    self.best_cost, best_solution = cost, grid.dump_solution()
+            else:
+                grid.rollback()
+
+            temperature = max(self.min_temperature, temperature * self.cooling_rate)
+
+        grid.load_solution(*best_solution)
+        return self.best_cost
+
+    def relocate_component(self):
+        grid = self.problem.grid
+        component = random.choice(grid.components)
+        server = random.choice(grid.servers)
+
+        if not component.is_deployed_on_server() or server.server_id == component.server_id:
+            return None
+        if not server.can_host(component):
+            return None
+
+        return self.__move({component: server})
+
+    def swap_components(self):
+        grid = self.problem.grid
+        first, second = random.sample(grid.components, 2)
+
+        if not first.is_deployed_on_server() or not second.is_deployed_on_server():
+            return None
+        if first.server_id == second.server_id:
+            return None
+
+        first_server, second_server = grid.servers[first.server_id], grid.servers[second.server_id]
+        difference = second.resource_vector - first.resource_vector
+        if not first_server.fits(difference) or not second_server.fits(-difference):
+            return None
+
+        return self.__move({first: second_server, second: first_server})
+
+    def reroute_demand(self):
+        grid = self.problem.grid
+        link_demand = random.choice(grid.link_demands)
+        link = link_demand.link
+
+        if len(link.nodes) == 0:
+            return None
+
+        old_route = list(link.nodes)
+        grid.remove_link_route(link, link_demand.throughput)
+
+        routes = [
+            route for route in grid.get_feasible_routes(
+                old_route[0], old_route[-1], link_demand.throughput, link.get_delay_budget()
+            )
+            if route != old_route
+        ]
+
+        if len(routes) == 0:
+            return None
+
+        return grid.try_add_link_route(link, random.choice(routes), link_demand.throughput)
+
+    def colocate_demand(self):
+        grid = self.problem.grid
+        link_demand = random.choice(grid.link_demands)
+        link = link_demand.link
+
+        if len(link.nodes) == 0:
+            return None
+
+        component, partner = random.sample((link.start_component, link.end_component), 2)
+        server = grid.servers[component.server_id]
+        node = grid.get_component_node(partner)
+
+        targets = [target for target in node.servers if target.can_host(component)]
+        if len(targets) > 0:
+            return self.__move({component: random.choice(targets)})
+
+        other = random.choice([other for target in node.servers for other in target.components])
+        other_server = grid.servers[other.server_id]
+        difference = other.resource_vector - component.resource_vector
+        if not server.fits(difference) or not other_server.fits(-difference):
+            return None
+
+        return self.__move({component: other_server, other: server})
+
+    def empty_server(self):
+        grid = self.problem.grid
+        active_servers = grid.ledger.active_servers
+        if len(active_servers) < 2:
+            return None
+
+        candidates = random.sample(active_servers, min(self.tournament_size, len(active_servers)))
+        server = min(candidates, key=lambda x: grid.ledger.server_resources_used[x.server_id])
+        targets = [target for target in active_servers if target is not server]
+        random.shuffle(targets)
+
+        residual_resources = {target: target.residual_resources.copy() for target in targets}
+        assignment = dict()
+        for component in server.components:
+            for target in targets:
+                if np.all(residual_resources[target] > component.resource_vector - Server.tolerance):
+                    residual_resources[target] -= component.resource_vector
+                    assignment[component] = target
+                    break
+            else:
+                return None
+
+        return self.__move(assignment)
+
+    def __move(self, assignment):
+        link_demands = []
+        for component in assignment:
+            for link_demand in self.problem.grid.component_demands[component]:
+                if link_demand not in link_demands:
+                    link_demands.append(link_demand)
+
+        self.__unroute(link_demands)
+        self.__place(assignment)
+
+        for link_demand in link_demands:
+            if not self.__route(link_demand):
+                return None
+
+        return True
+
+    def __unroute(self, link_demands):
+        for link_demand in link_demands:
+            if len(link_demand.link.nodes) > 0:
+                self.problem.grid.remove_link_route(link_demand.link, link_demand.throughput)
+
+    def __place(self, assignment):
+        grid = self.problem.grid
+
+        for component in assignment:
+            grid.servers[component.server_id].remove_component(component)
+        for component, server in assignment.items():
+            server.add_component(component)
+
+    def __route(self, link_demand):
+        grid = self.problem.grid
+        link = link_demand.link
+
+        if grid.are_components_on_same_node(link.start_component, link.end_component):
+            return True
+
+        route = grid.get_best_feasible_route(
+            link.start_component, link.end_component, link_demand.throughput, key=self.__route_power,
+            max_delay=link.get_delay_budget()
+        )
+        return route is not None and grid.try_add_link_route(link, route, link_demand.throughput)
+
+    def __route_power(self, nodes):
+        grid = self.problem.grid
+        power = sum([node.power_usage for node in nodes if not grid.is_active_node(node)])
+
+        for i in range(1, len(nodes)):
+            edge = grid.get_edge(nodes[i - 1], nodes[i])
+            if not grid.is_active_edge(edge):
+                power += edge.power_usage
+
+        return power
@@ -0,0 +1,119 @@
+from algorithms import Algorithm
+from algorithms.greedy import GreedyHeuristic
+from core.batch import GridArrays, BatchEvaluator
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GeneticAlgorithm(Algorithm):
+
+    def __init__(self, problem, population_size=100, generations=200, crossover_rate=0.9, mutation_rate=0.02,
+                 elite_size=2, tournament_size=3, penalty=1000.0, seed=None):
+        super(GeneticAlgorithm, self).__init__(problem)
+        assert population_size > elite_size, 'Population should be larger then the elite.'
+        assert 0 <= crossover_rate <= 1, 'Crossover rate should be between 0 and 1.'
+        assert 0 <= mutation_rate <= 1, 'Mutation rate should be between 0 and 1.'
+
+        self.population_size = population_size
+        self.generations = generations
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.elite_size = elite_size
+        self.tournament_size = tournament_size
+        self.penalty = penalty
+        self.random = np.random.RandomState(seed)
+
+        self.greedy = GreedyHeuristic(problem)
+        self.evaluator = None
+
+        self.best_cost = None
+        self.best_violations = None
+        self.unrouted_demands = []
+
+    def deploy_components(self):
+        self.greedy.deploy_components()
+
+    def deploy_routes(self):
+        self.greedy.deploy_routes()
+        self.evolve()
+
+    def deploy_service_chain(self, service_chain, link_demands):
+        return self.greedy.deploy_service_chain(service_chain, link_demands)
+
+    def evolve(self):
+        grid = self.problem.grid
+        if self.evaluator is None or self.evaluator.arrays.grid is not grid or \
+                self.evaluator.arrays.revision != grid.revision:
+            self.evaluator = BatchEvaluator(GridArrays(grid))
+
+        placement, choices = self.evaluator.encode(grid)
+        placements = np.tile(placement, (self.population_size, 1))
+        route_choices = np.tile(choices, (self.population_size, 1))
+        self.__mutate(placements[1:], route_choices[1:])
+
+        scores, fitness, violations = self.__score(placements, route_choices)
+
+        for generation in range(self.generations):
+            if self.should_stop():
+                break
+
+            elite = np.argsort(scores)[:self.elite_size]
+
+            first_parents = self.__select(scores, self.population_size - self.elite_size)
+            second_parents = self.__select(scores, self.population_size - self.elite_size)
+            children, children_choices = self.__crossover(
+                placements[first_parents], placements[second_parents],
+                route_choices[first_parents], route_choices[second_parents]
+            )
+            self.__mutate(children, children_choices)
+
+            placements = np.concatenate([placements[elite], children])
+            route_choices = np.concatenate([route_choices[elite], children_choices])
+            scores, fitness, violations = self.__score(placements, route_choices)
+
+        best = int(np.argmin(scores))
+        unrouted_demands = grid.load_solution(*self.evaluator.decode(placements[best], route_choices[best]))
+        self.unrouted_demands = self.greedy.route_demands(unrouted_demands)
+        logger.debug('Unrouted demands: %d - %s', len(self.unrouted_demands), self.unrouted_demands)
+
+        self.best_cost = self.problem.fitness()
+        self.best_violations = np.array([
+            len(violations) for violations in self.problem.constraint_service.violations().values()
+        ])
+        return self.best_cost
+
+    def __score(self, placements, route_choices):
+        fitness, violations = self.evaluator.evaluate(placements, route_choices)
+        return fitness + self.penalty * violations.sum(axis=1), fitness, violations
+
+    def __select(self, scores, number_of_parents):
+        contestants = self.random.randint(len(scores), size=(number_of_parents, self.tournament_size))
+        winners = np.argmin(scores[contestants], axis=1)
+        return contestants[np.arange(number_of_parents), winners]
+
+    def __crossover(self, first_placements, second_placements, first_choices, second_choices):
+        crossed = self.random.rand(len(first_placements)) < self.crossover_rate
+
+        placement_mask = crossed[:, None] & (self.random.rand(*first_placements.shape) < 0.5)
+        choice_mask = crossed[:, None] & (self.random.rand(*first_choices.shape) < 0.5)
+
+        return (
+            np.where(placement_mask, second_placements, first_placements),
+            np.where(choice_mask, second_choices, first_choices)
+        )
+
+    def __mutate(self, placements, route_choices):
+        number_of_servers = len(self.evaluator.arrays.server_node)
+
+        mutated = self.random.rand(*placements.shape) < self.mutation_rate
+        candidates, components = np.nonzero(mutated)
+
+        random_servers = self.random.randint(number_of_servers, size=len(candidates))
+        partner_servers = placements[candidates, self.random.randint(placements.shape[1], size=len(candidates))]
+        use_partner = (self.random.rand(len(candidates)) < 0.5) & (partner_servers > -1)
+        placements[candidates, components] = np.where(use_partner, partner_servers, random_servers)
+
+        rerouted = self.random.rand(*route_choices.shape) < self.mutation_rate
+        route_choices[rerouted] = self.random.randint(self.evaluator.route_table.k, size=int(rerouted.sum()))
@@ -1,49 +1,79 @@
 from algorithms import Algorithm
+from algorithms.placement import PlacementEngine
+from utils.instrumentation import timed
+import logging
 import random
 
+logger = logging.getLogger(__name__)
+
 
 class GreedyHeuristic(Algorithm):
+    packings = PlacementEngine.strategies
 
-    def __init__(self, problem):
+    def __init__(self, problem, packing='dot_product'):
         super(GreedyHeuristic, self).__init__(problem)
+        assert packing in self.packings, 'Packing should be one of {0}.'.format(self.packings)
+
+        self.packing = packing
+        self.node_ranks = None
 
+    @timed('placement')
     def deploy_components(self):
-        servers = self.problem.grid.servers
-        servers = sorted(servers, key=lambda x: x.node_id, reverse=True)
-        components = sorted(self.problem.grid.components, key=lambda x: x.resources_needed, reverse=False)
+        self.place_components(self.problem.grid.components)
+
+        empty_servers = [server.server_id for server in self.problem.grid.servers if not server.is_active()]
+        logger.debug('Empty servers: %d - %s', len(empty_servers), empty_servers)
+
+    def placement_engine(self):
+        grid = self.problem.grid
+        if self.packing not in grid.placement_engines:
+            engine = PlacementEngine(grid.servers, self.packing, grid.component_demands)
+            grid.placement_engines[self.packing] = engine
+            grid.subscribe(engine)
+
+        return grid.placement_engines[self.packing]
 
-        for component in components:
-            #random.shuffle(servers)
+    def place_components(self, components, excluded_servers=()):
+        return self.placement_engine().place(components, excluded_servers)
 
-            for server in servers:
-                if server.get_available_resources() > component.resources_needed:
-                    server.add_component(component)
-                    break
+    def deploy_service_chain(self, service_chain, link_demands):
+        components = [component for component in service_chain.components if not component.is_deployed_on_server()]
+        unplaced_components = self.place_components(components)
 
-        empty_servers = [server.server_id for server in servers if not server.is_active()]
-        print('Empty servers: {0} - {1}'.format(len(empty_servers), empty_servers))
+        link_demands = [link_demand for link_demand in link_demands if len(link_demand.link.nodes) == 0]
+        return unplaced_components, self.route_demands(link_demands)
 
+    @timed('routing')
     def deploy_routes(self):
-        link_demands = sorted(self.problem.grid.link_demands, key=lambda x: x.throughput, reverse=True)
+        empty_demands = self.route_demands(self.problem.grid.link_demands, rank_nodes=True)
+        logger.debug('Empty demands: %d - %s', len(empty_demands), empty_demands)
+
+    def route_demands(self, link_demands, rank_nodes=False):
+        link_demands = sorted(link_demands, key=lambda x: x.throughput, reverse=True)
         random.shuffle(link_demands)
 
+        if rank_nodes or self.node_ranks is None:
+            self.node_ranks = list(range(len(self.problem.grid.nodes)))
+            random.shuffle(self.node_ranks)
+        node_ranks = self.node_ranks
+
         empty_demands = []
         for link_demand in link_demands:
             link = link_demand.link
 
-            routes = self.problem.grid.get_routes(link.start_component, link.end_component)
-
-            if len(routes) > 0:
-                valid_routes = self.__filter_non_valid_routes(routes, link_demand.throughput)
-
-                if len(valid_routes) == 0:
-                    empty_demands.append(link_demand)
-                    continue
+            if not link.start_component.is_deployed_on_server() or not link.end_component.is_deployed_on_server():
+                empty_demands.append(link_demand)
+                continue
+            if self.problem.grid.are_components_on_same_node(link.start_component, link.end_component):
+                continue
 
-                valid_routes = sorted(valid_routes, key=lambda x: len(x), reverse=False)
-                self.problem.grid.add_link_route(link, valid_routes[0], link_demand.throughput)
+            route = self.problem.grid.get_best_feasible_route(
+                link.start_component, link.end_component, link_demand.throughput,
+                key=lambda x: (len(x), [node_ranks[node.node_id] for node in x]),
+                max_delay=link.get_delay_budget()
+            )
 
-        print('Empty demands: {0} - {1}'.format(len(empty_demands), empty_demands))
+            if route is None or not self.problem.grid.try_add_link_route(link, route, link_demand.throughput):
+                empty_demands.append(link_demand)
 
-    def __filter_non_valid_routes(self, routes, throughput):
-        return list(filter(lambda x: self.problem.grid.min_available_route_capacity(x) > throughput, routes))
+        return empty_demands
@@ -0,0 +1,162 @@
+from algorithms import Algorithm
+from algorithms.greedy import GreedyHeuristic
+import random
+import math
+
+
+class AdaptiveLargeNeighbourhoodSearch(Algorithm):
+
+    def __init__(self, problem, iterations=3000, segment_length=50, reaction=0.2, rewards=(33.0, 9.0, 13.0),
+                 neighbourhood_size=4, initial_temperature=200.0, cooling_rate=0.998, min_temperature=0.01):
+        super(AdaptiveLargeNeighbourhoodSearch, self).__init__(problem)
+        assert 0 < reaction <= 1, 'Reaction factor should be between 0 and 1.'
+        assert 0 < cooling_rate < 1, 'Cooling rate should be between 0 and 1.'
+        assert len(rewards) == 3, 'Rewards are given for a new best, an improving and an accepted solution.'
+
+        self.iterations = iterations
+        self.segment_length = segment_length
+        self.reaction = reaction
+        self.rewards = rewards
+        self.neighbourhood_size = neighbourhood_size
+        self.initial_temperature = initial_temperature
+        self.cooling_rate = cooling_rate
+        self.min_temperature = min_temperature
+
+        self.greedy = GreedyHeuristic(problem)
+        self.destroy_operators = [self.empty_server, self.empty_node, self.remove_chain_neighbourhood]
+        self.weights = [1.0] * len(self.destroy_operators)
+
+        self.best_cost = None
+        self.accepted_moves = 0
+
+    def deploy_components(self):
+        self.greedy.deploy_components()
+
+    def deploy_routes(self):
+        self.greedy.deploy_routes()
+        self.improve()
+
+    def deploy_service_chain(self, service_chain, link_demands):
+        return self.greedy.deploy_service_chain(service_chain, link_demands)
+
+    def reoptimize(self, iterations):
+        return self.improve(iterations)
+
+    def improve(self, iterations=None):
+        grid = self.problem.grid
+        cost = grid.ledger.total_power()
+        self.best_cost, best_solution = cost, grid.dump_solution()
+        temperature = self.initial_temperature
+
+        scores = [0.0] * len(self.destroy_operators)
+        uses = [0] * len(self.destroy_operators)
+
+        for i in range(self.iterations if iterations is None else iterations):
+            if self.should_stop():
+                break
+
+            operator = random.choices(range(len(self.destroy_operators)), weights=self.weights)[0]
+            uses[operator] += 1
+            grid.checkpoint()
+
+            destroyed = self.destroy_operators[operator]()
+            if destroyed is None or not self.repair(*destroyed):
+                grid.rollback()
+                continue
+
+            delta = grid.ledger.total_power() - cost
+            if delta < -1e-9 or random.random() < math.exp(-max(delta, 0) / temperature):
+                grid.commit()
+                cost += delta
+                self.accepted_moves += 1
+
+                if cost < self.best_cost - 1e-9:
+                    self.best_cost, best_solution = cost, grid.dump_solution()
+                    scores[operator] += self.rewards[0]
+                elif delta < -1e-9:
+                    scores[operator] += self.rewards[1]
+                else:
+                    scores[operator] += self.rewards[2]
+            else:
+                grid.rollback()
+
+            temperature = max(self.min_temperature, temperature * self.cooling_rate)
+
+            if (i + 1) % self.segment_length == 0:
+                self.__update_weights(scores, uses)
+                scores = [0.0] * len(self.destroy_operators)
+                uses = [0] * len(self.destroy_operators)
+
+        grid.load_solution(*best_solution)
+        return self.best_cost
+
+    def empty_server(self):
+        active_servers = self.problem.grid.ledger.active_servers
+        if len(active_servers) < 2:
+            return None
+
+        server = random.choice(active_servers)
+        return self.__destroy(list(server.components), [server])
+
+    def empty_node(self):
+        active_nodes = self.problem.grid.ledger.active_server_nodes
+        if len(active_nodes) < 2:
+            return None
+
+        node = random.choice(active_nodes)
+        components = [component for server in node.servers for component in server.components]
+        return self.__destroy(components, node.servers)
+
+    def remove_chain_neighbourhood(self):
+        grid = self.problem.grid
+        if len(grid.service_chains) == 0:
+            return None
+
+        chains = [random.choice(grid.service_chains)]
+        visited = set(chains)
+        components = []
+
+        while len(chains) > 0 and len(components) < self.neighbourhood_size:
+            service_chain = chains.pop(0)
+            for component in service_chain.components:
+                if component not in components:
+                    components.append(component)
+
+                for related_chain in grid.component_chains[component]:
+                    if related_chain not in visited:
+                        visited.add(related_chain)
+                        chains.append(related_chain)
+
+        return self.__destroy(components, [])
+
+    def repair(self, components, link_demands, forbidden_servers):
+        if len(self.greedy.place_components(components, forbidden_servers)) > 0:
+            return False
+
+        return len(self.greedy.route_demands(link_demands)) == 0
+
+    def __destroy(self, components, forbidden_servers):
+        grid = self.problem.grid
+        components = [component for component in components if component.is_deployed_on_server()]
+        if len(components) == 0:
+            return None
+
+        link_demands = []
+        for component in components:
+            for link_demand in grid.component_demands[component]:
+                if link_demand not in link_demands:
+                    link_demands.append(link_demand)
+
+        for link_demand in link_demands:
+            if len(link_demand.link.nodes) > 0:
+                grid.remove_link_route(link_demand.link, link_demand.throughput)
+        for component in components:
+            grid.servers[component.server_id].remove_component(component)
+
+        return components, link_demands, forbidden_servers
+
+    def __update_weights(self, scores, uses):
+        for i in range(len(self.weights)):
+            if uses[i] > 0:
+                self.weights[i] = (1 - self.reaction) * self.weights[i] + self.reaction * scores[i] / uses[i]
+            self.weights[i] = max(self.weights[i], 0.05)
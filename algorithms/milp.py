@@ -0,0 +1,300 @@
+from algorithms import Algorithm
+from algorithms.greedy import GreedyHeuristic
+import collections
+import itertools
+import tempfile
+import warnings
+import logging
+import time
+import os
+import re
+
+try:
+    import pulp
+except ImportError:
+    pulp = None
+
+logger = logging.getLogger(__name__)
+
+
+class MilpSolver(Algorithm):
+    delay_tolerance = 1e-6
+
+    def __init__(self, problem, time_limit=60, warm_start=True, relative_gap=None, threads=None, verbose=False,
+                 routes_per_pair=3):
+        super(MilpSolver, self).__init__(problem)
+        assert pulp is not None, 'MilpSolver needs PuLP (pip install pulp).'
+        assert time_limit > 0, 'Time limit should be positive.'
+        assert routes_per_pair is None or routes_per_pair > 0, 'Routes per pair should be positive.'
+
+        self.time_limit = time_limit
+        self.warm_start = warm_start
+        self.relative_gap = relative_gap
+        self.threads = threads
+        self.verbose = verbose
+        self.routes_per_pair = routes_per_pair
+
+        self.greedy = GreedyHeuristic(problem)
+        self.model = None
+        self.placement_variables = None
+        self.route_variables = None
+        self.activity_variables = None
+
+        self.status = None
+        self.best_cost = None
+        self.lower_bound = None
+
+    def deploy_components(self):
+        if self.warm_start:
+            self.greedy.deploy_components()
+
+    def deploy_routes(self):
+        if self.warm_start:
+            self.greedy.deploy_routes()
+        self.solve()
+
+    def deploy_service_chain(self, service_chain, link_demands):
+        return self.greedy.deploy_service_chain(service_chain, link_demands)
+
+    def gap(self):
+        if self.best_cost is None or self.lower_bound is None or self.best_cost == 0:
+            return None
+        return (self.best_cost - self.lower_bound) / self.best_cost
+
+    def solve(self):
+        deadline = time.time() + self.time_limit
+        grid = self.problem.grid
+
+        warm_start = self.warm_start and all(component.is_deployed_on_server() for component in grid.components)
+        self.best_cost = grid.ledger.total_power() if warm_start else None
+        self.lower_bound = None
+        self.status = 'not solved'
+
+        if not self.__build_model(grid, deadline):
+            logger.warning('MILP model build did not finish within %s seconds.', self.time_limit)
+            return self.best_cost, self.lower_bound
+
+        if warm_start:
+            self.__set_initial_values(grid)
+
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, 'cbc.log')
+            self.model.solve(self.__create_solver(max(deadline - time.time(), 1), warm_start, log_path))
+            log = ''
+            if os.path.exists(log_path):
+                with open(log_path) as log_file:
+                    log = log_file.read()
+
+        logger.log(logging.INFO if self.verbose else logging.DEBUG, 'CBC log:\n%s', log)
+
+        solution_status = self.model.sol_status
+        self.status = {
+            pulp.LpSolutionOptimal: 'optimal', pulp.LpSolutionIntegerFeasible: 'feasible',
+            pulp.LpSolutionInfeasible: 'infeasible', pulp.LpSolutionUnbounded: 'unbounded'
+        }.get(solution_status, 'not solved')
+
+        if solution_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+            self.__load_solution(grid)
+            self.best_cost = grid.ledger.total_power()
+        self.lower_bound = self.__parse_lower_bound(log, solution_status)
+
+        return self.best_cost, self.lower_bound
+
+    def __create_solver(self, time_limit, warm_start, log_path):
+        options = dict(
+            timeLimit=time_limit, warmStart=warm_start, gapRel=self.relative_gap, threads=self.threads, msg=False,
+            logPath=log_path
+        )
+        if pulp.COIN_CMD().available():
+            return pulp.COIN_CMD(**options)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            return pulp.PULP_CBC_CMD(**options)
+
+    def __build_model(self, grid, deadline):
+        model = pulp.LpProblem('vnf_placement', pulp.LpMinimize)
+
+        def binary(name):
+            if hasattr(model, 'add_variable'):
+                return model.add_variable(name, cat=pulp.LpBinary)
+            return pulp.LpVariable(name, cat=pulp.LpBinary)
+
+        server_nodes = sorted(set(server.node_id for server in grid.servers))
+
+        x = {
+            (component.component_id, server.server_id): binary(
+                'x_{0}_{1}'.format(component.component_id, server.server_id)
+            )
+            for component in grid.components for server in grid.servers
+        }
+        active_servers = {server.server_id: binary('s_{0}'.format(server.server_id)) for server in grid.servers}
+        active_nodes = {node.node_id: binary('n_{0}'.format(node.node_id)) for node in grid.nodes}
+        active_edges = {edge: binary('e_{0}'.format(i)) for i, edge in enumerate(grid.edges)}
+
+        def add_constraint(terms, sense, rhs=0):
+            model.addConstraint(pulp.LpConstraint(pulp.LpAffineExpression(terms), sense, rhs=rhs))
+
+        for component in grid.components:
+            add_constraint(
+                [(x[component.component_id, server.server_id], 1) for server in grid.servers], pulp.LpConstraintEQ, 1
+            )
+
+        servers_power = []
+        for server in grid.servers:
+            server_id = server.server_id
+            for component in grid.components:
+                add_constraint(
+                    [(x[component.component_id, server_id], 1), (active_servers[server_id], -1)], pulp.LpConstraintLE
+                )
+            for resource, available in enumerate(server.resources_available):
+                add_constraint([
+                    (x[component.component_id, server_id], component.resource_vector[resource])
+                    for component in grid.components
+                ], pulp.LpConstraintLE, available)
+            add_constraint([(active_servers[server_id], 1), (active_nodes[server.node_id], -1)], pulp.LpConstraintLE)
+
+            slope = (server.max_power - server.min_power) / server.max_resources
+            servers_power.append((active_servers[server_id], server.min_power))
+            servers_power.extend(
+                (x[component.component_id, server_id], slope * component.resources_needed)
+                for component in grid.components
+            )
+
+        if time.time() > deadline:
+            return False
+
+        pair_routes = dict()
+        for start_node_id, end_node_id in itertools.permutations(server_nodes, 2):
+            start_node, end_node = grid.nodes[start_node_id], grid.nodes[end_node_id]
+            pair_routes[start_node_id, end_node_id] = [
+                (j, route, edges, delay, min(edge.capacity for edge in edges))
+                for j, (route, edges, delay) in enumerate(zip(
+                    grid.route_cache.get_routes(start_node, end_node),
+                    grid.route_cache.get_route_edges(start_node, end_node),
+                    grid.route_cache.get_route_delays(start_node, end_node)
+                ))
+            ]
+
+        route_variables = dict()
+        edge_traffic = {edge: [] for edge in grid.edges}
+        demand_delays = dict()
+
+        for i, link_demand in enumerate(grid.link_demands):
+            link = link_demand.link
+            max_delay = min([service_chain.max_delay for service_chain in link.service_chains] + [float('inf')])
+            demand_delays[link] = []
+            start_routes = collections.defaultdict(list)
+            end_routes = collections.defaultdict(list)
+            used_pair = (link.nodes[0].node_id, link.nodes[-1].node_id) if len(link.nodes) > 0 else None
+
+            for node_id in server_nodes:
+                variable = binary('r_{0}_{1}_{1}_0'.format(i, node_id))
+                route_variables[i, node_id, node_id, 0] = (variable, [])
+                start_routes[node_id].append((variable, 1))
+                end_routes[node_id].append((variable, 1))
+
+            for (start_node_id, end_node_id), routes in pair_routes.items():
+                candidates = routes[:self.routes_per_pair]
+                if (start_node_id, end_node_id) == used_pair:
+                    candidates = candidates + [
+                        candidate for candidate in routes[len(candidates):] if candidate[1] == link.nodes
+                    ]
+
+                for j, route, edges, delay, capacity in candidates:
+                    if delay > max_delay - self.delay_tolerance or capacity < link_demand.throughput:
+                        continue
+
+                    variable = binary('r_{0}_{1}_{2}_{3}'.format(i, start_node_id, end_node_id, j))
+                    route_variables[i, start_node_id, end_node_id, j] = (variable, route)
+                    start_routes[start_node_id].append((variable, 1))
+                    end_routes[end_node_id].append((variable, 1))
+
+                    for edge in edges:
+                        edge_traffic[edge].append((variable, link_demand.throughput))
+                    demand_delays[link].append((variable, delay))
+
+            for node_id in server_nodes:
+                for component, routes in ((link.start_component, start_routes), (link.end_component, end_routes)):
+                    add_constraint(routes[node_id] + [
+                        (x[component.component_id, server.server_id], -1) for server in grid.node_servers[node_id]
+                    ], pulp.LpConstraintEQ)
+
+            if time.time() > deadline:
+                return False
+
+        node_edges = collections.defaultdict(list)
+        for edge in grid.edges:
+            add_constraint(edge_traffic[edge] + [(active_edges[edge], -edge.capacity)], pulp.LpConstraintLE)
+            for node in (edge.start_node, edge.end_node):
+                add_constraint([(active_edges[edge], 1), (active_nodes[node.node_id], -1)], pulp.LpConstraintLE)
+                node_edges[node.node_id].append((active_edges[edge], -1))
+
+        for node in grid.nodes:
+            add_constraint([(active_nodes[node.node_id], 1)] + node_edges[node.node_id] + [
+                (active_servers[server.server_id], -1) for server in node.servers
+            ], pulp.LpConstraintLE)
+
+        for service_chain in grid.service_chains:
+            add_constraint(
+                [term for link in service_chain.links for term in demand_delays[link]],
+                pulp.LpConstraintLE, service_chain.max_delay - self.delay_tolerance
+            )
+
+        model.setObjective(pulp.LpAffineExpression(
+            [(active_edges[edge], edge.power_usage) for edge in grid.edges] +
+            [(active_nodes[node.node_id], node.power_usage) for node in grid.nodes] + servers_power
+        ))
+
+        self.model = model
+        self.placement_variables = x
+        self.route_variables = route_variables
+        self.activity_variables = (active_servers, active_nodes, active_edges)
+        return time.time() <= deadline
+
+    def __set_initial_values(self, grid):
+        for (component_id, server_id), variable in self.placement_variables.items():
+            variable.setInitialValue(1 if grid.components[component_id].server_id == server_id else 0)
+
+        used_routes = dict()
+        for i, link_demand in enumerate(grid.link_demands):
+            link = link_demand.link
+            if len(link.nodes) > 0:
+                used_routes[i, link.nodes[0].node_id, link.nodes[-1].node_id] = link.nodes
+            elif grid.are_components_on_same_node(link.start_component, link.end_component):
+                node_id = grid.get_component_node(link.start_component).node_id
+                used_routes[i, node_id, node_id] = []
+
+        for (i, start_node_id, end_node_id, j), (variable, route) in self.route_variables.items():
+            variable.setInitialValue(1 if used_routes.get((i, start_node_id, end_node_id)) == route else 0)
+
+        active_servers, active_nodes, active_edges = self.activity_variables
+        for server in grid.servers:
+            active_servers[server.server_id].setInitialValue(1 if server.is_active() else 0)
+        for node in grid.nodes:
+            active_nodes[node.node_id].setInitialValue(1 if grid.is_active_node(node) else 0)
+        for edge, variable in active_edges.items():
+            variable.setInitialValue(1 if grid.is_active_edge(edge) else 0)
+
+    def __load_solution(self, grid):
+        placement = [None] * len(grid.components)
+        for (component_id, server_id), variable in self.placement_variables.items():
+            if variable.varValue is not None and variable.varValue > 0.5:
+                placement[component_id] = server_id
+
+        routes = [[] for link_demand in grid.link_demands]
+        for (i, start_node_id, end_node_id, j), (variable, route) in self.route_variables.items():
+            if variable.varValue is not None and variable.varValue > 0.5:
+                routes[i] = [node.node_id for node in route]
+
+        grid.load_solution(placement, routes)
+
+    def __parse_lower_bound(self, log, solution_status):
+        match = re.search(r'Lower bound:\s*([-+\d.eE]+)', log)
+        if match is not None:
+            return float(match.group(1))
+
+        if solution_status == pulp.LpSolutionOptimal:
+            return pulp.value(self.model.objective)
+
+        return None
@@ -0,0 +1,171 @@
+from algorithms.greedy import GreedyHeuristic
+from core.problem import Problem
+from utils.instrumentation import instrumentation
+import multiprocessing
+import logging
+import random
+import queue
+import time
+
+logger = logging.getLogger(__name__)
+
+worker_problem = None
+worker_profile = None
+
+
+def init_worker(file_path, data, instrumented=False, profile=None):
+    global worker_problem, worker_profile
+
+    worker_problem = Problem(file_path)
+    worker_problem.build(data)
+    worker_profile = profile
+
+    if instrumented:
+        instrumentation.enable()
+
+
+def run_restarts(seed, iterations, target_cost, deadline):
+    random.seed(seed)
+    if worker_profile is not None:
+        instrumentation.start_capture(*worker_profile)
+
+    best_cost, best_solution, best_feasible = None, None, None
+    done = 0
+
+    for i in range(iterations):
+        worker_problem.init()
+
+        greedy = GreedyHeuristic(worker_problem)
+        greedy.deploy_components()
+        greedy.deploy_routes()
+        cost = worker_problem.fitness()
+        done += 1
+
+        if best_cost is None or cost < best_cost:
+            best_cost, best_solution = cost, worker_problem.grid.dump_solution()
+            best_feasible = worker_problem.constraint_service.is_feasible()
+
+        if target_cost is not None and best_cost < target_cost:
+            break
+        if deadline is not None and time.time() > deadline:
+            break
+
+    metrics, capture = None, None
+    if worker_profile is not None:
+        instrumentation.stop_capture()
+        capture = instrumentation.capture_snapshot()
+    if instrumentation.enabled:
+        metrics = instrumentation.snapshot()
+    instrumentation.reset()
+
+    return seed, iterations, done, best_cost, best_solution, best_feasible, metrics, capture
+
+
+class ParallelRestartSearch(object):
+    profiles = (None, 'cpu', 'memory', 'all')
+
+    def __init__(self, problem, workers=None, target_cost=None, time_limit=None, max_iterations=None, batch_size=50,
+                 seed=None, archive=None, profile=None):
+        assert target_cost is not None or time_limit is not None or max_iterations is not None, \
+            'At least one stopping criterion (target cost, time limit or iteration budget) is needed.'
+        assert batch_size > 0, 'Batch size should be positive.'
+        assert profile in self.profiles, 'Profile should be one of {0}.'.format(self.profiles)
+
+        self.problem = problem
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.target_cost = target_cost
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.batch_size = batch_size
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.archive = archive
+        self.profile = profile
+        self.start_time = None
+
+        self.best_cost = None
+        self.best_solution = None
+        self.best_seed = None
+        self.iterations = 0
+        self.scheduled = 0
+
+    def run(self):
+        if self.problem.grid is None:
+            self.problem.init()
+
+        self.start_time = time.time()
+        deadline = self.start_time + self.time_limit if self.time_limit is not None else None
+        results = queue.Queue()
+        profile = None
+        if self.profile is not None:
+            profile = (self.profile in ('cpu', 'all'), self.profile in ('memory', 'all'))
+        pool = multiprocessing.Pool(
+            self.workers, initializer=init_worker,
+            initargs=(self.problem.file_path, self.problem.data, instrumentation.enabled, profile)
+        )
+
+        try:
+            pending = 0
+            next_seed = self.seed
+
+            while True:
+                while pending < self.workers and self.__next_batch_size() > 0:
+                    batch_size = self.__next_batch_size()
+                    pool.apply_async(
+                        run_restarts, (next_seed, batch_size, self.target_cost, deadline),
+                        callback=results.put, error_callback=results.put
+                    )
+                    self.scheduled += batch_size
+                    pending += 1
+                    next_seed += 1
+
+                if pending == 0:
+                    break
+
+                result = results.get()
+                pending -= 1
+                if isinstance(result, Exception):
+                    raise result
+
+                self.__collect(*result)
+
+                if self.__should_stop(deadline):
+                    break
+        finally:
+            pool.terminate()
+            pool.join()
+
+        if self.best_solution is not None:
+            self.problem.grid.load_solution(*self.best_solution)
+
+        return self.best_cost
+
+    def __collect(self, seed, batch_size, iterations, cost, solution, feasible, metrics, capture):
+        self.scheduled -= batch_size
+        self.iterations += iterations
+
+        if metrics is not None:
+            instrumentation.merge(*metrics)
+        if capture is not None:
+            instrumentation.merge_capture(*capture)
+
+        if cost is not None and (self.best_cost is None or cost < self.best_cost):
+            self.best_cost, self.best_solution, self.best_seed = cost, solution, seed
+            logger.info('Best cost: %s (seed %d, %d iterations)', cost, seed, self.iterations)
+
+            if self.archive is not None:
+                self.archive.add(*solution, cost=cost, seed=seed, algorithm='parallel_greedy', timings={
+                    'elapsed': time.time() - self.start_time, 'iterations': self.iterations
+                }, feasible=feasible)
+
+    def __next_batch_size(self):
+        if self.max_iterations is None:
+            return self.batch_size
+
+        return min(self.batch_size, self.max_iterations - self.iterations - self.scheduled)
+
+    def __should_stop(self, deadline):
+        if self.target_cost is not None and self.best_cost is not None and self.best_cost < self.target_cost:
+            return True
+        if deadline is not None and time.time() > deadline:
+            return True
+        return self.max_iterations is not None and self.iterations >= self.max_iterations
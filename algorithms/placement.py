@@ -0,0 +1,219 @@
+from core.entities import Server
+import numpy as np
+
+
+class PlacementEngine(object):
+    strategies = (
+        'first_fit', 'dot_product', 'first_fit_decreasing', 'best_fit_decreasing', 'power_efficiency', 'affinity'
+    )
+    decreasing_strategies = ('first_fit_decreasing', 'best_fit_decreasing', 'power_efficiency')
+
+    def __init__(self, servers, strategy='dot_product', component_demands=None):
+        assert strategy in self.strategies, 'Strategy should be one of {0}.'.format(self.strategies)
+        assert strategy != 'affinity' or component_demands is not None, 'Affinity placement needs link demands.'
+
+        self.strategy = strategy
+        self.component_demands = component_demands
+        self.servers = sorted(servers, key=lambda x: x.node_id, reverse=True)
+        if strategy == 'power_efficiency':
+            self.servers = sorted(self.servers, key=lambda x: x.max_power / x.max_resources)
+
+        self.capacities = np.array([server.resources_available for server in self.servers], dtype=float).T.copy()
+        self.power_slopes = np.array([
+            (server.max_power - server.min_power) / server.max_resources for server in self.servers
+        ])
+        self.server_nodes = np.array([server.node_id for server in self.servers], dtype=np.int64)
+        self.server_index = {server.server_id: index for index, server in enumerate(self.servers)}
+        self.excluded = np.zeros(len(self.servers), dtype=bool)
+        self.rebuild()
+
+    def rebuild(self):
+        self.residuals = np.array([server.residual_resources for server in self.servers], dtype=float).T.copy()
+        self.inactive = np.array([not server.is_active() for server in self.servers], dtype=bool)
+        self.slack = np.sum(self.residuals / self.capacities, axis=0)
+
+        self.node_active_servers = np.zeros(self.server_nodes.max() + 1 if len(self.servers) > 0 else 0, dtype=int)
+        np.add.at(self.node_active_servers, self.server_nodes[~self.inactive], 1)
+
+    def place(self, components, excluded_servers=()):
+        excluded = [self.server_index[server.server_id] for server in excluded_servers]
+        self.excluded[excluded] = True
+        try:
+            return self.__place(components)
+        finally:
+            self.excluded[excluded] = False
+
+    def __place(self, components):
+        if len(components) == 0:
+            return []
+        if self.strategy == 'affinity':
+            return self.__place_clusters(components)
+
+        sizes = np.array([component.resource_vector for component in components], dtype=float).sum(axis=1)
+        if self.strategy in self.decreasing_strategies:
+            sizes = -sizes
+        unplaced_components = []
+
+        for component_index in np.argsort(sizes, kind='stable'):
+            component = components[component_index]
+            server_index = self.select(component)
+            if server_index is None:
+                unplaced_components.append(component)
+                continue
+
+            self.assign(component, server_index)
+
+        return unplaced_components
+
+    def select(self, component):
+        feasible = self.__feasible(component.resource_vector)
+
+        if self.strategy == 'affinity':
+            return self.__affinity(component.resource_vector, [component], feasible)
+        if self.strategy == 'dot_product':
+            return self.__dot_product(component.resource_vector, feasible)
+
+        if self.strategy == 'best_fit_decreasing':
+            server_index = int(np.argmin(np.where(feasible, self.slack, np.inf)))
+        else:
+            server_index = int(np.argmax(feasible))
+
+        return server_index if feasible[server_index] else None
+
+    def assign(self, component, server_index):
+        server = self.servers[server_index]
+        server.add_component(component)
+        self.update(server)
+
+    def update(self, server):
+        server_index = self.server_index[server.server_id]
+        self.residuals[:, server_index] = server.residual_resources
+        if self.strategy == 'best_fit_decreasing':
+            self.slack[server_index] = np.sum(server.residual_resources / server.resources_available)
+
+        inactive = not server.is_active()
+        if inactive != self.inactive[server_index]:
+            self.inactive[server_index] = inactive
+            self.node_active_servers[self.server_nodes[server_index]] += -1 if inactive else 1
+
+    def on_component_added(self, server, component):
+        self.update(server)
+
+    def on_component_removed(self, server, component):
+        self.update(server)
+
+    def on_route_added(self, link, nodes, edges, throughput):
+        pass
+
+    def on_route_removed(self, link, nodes, edges, throughput):
+        pass
+
+    def on_service_chain_added(self, service_chain, components, link_demands):
+        pass
+
+    def on_service_chain_removed(self, service_chain, components, link_demands):
+        pass
+
+    def cluster(self, components):
+        clusters = {component: [component] for component in components}
+        cluster_of = {component: component for component in components}
+        demands = dict()
+
+        for component in components:
+            for link_demand in self.component_demands[component]:
+                link = link_demand.link
+                if link.start_component is component and link.end_component in cluster_of:
+                    pair = tuple(sorted((link.start_component, link.end_component), key=lambda x: x.component_id))
+                    demands[pair] = demands.get(pair, 0) + link_demand.throughput
+
+        for (start_component, end_component), throughput in sorted(demands.items(), key=lambda x: -x[1]):
+            first, second = cluster_of[start_component], cluster_of[end_component]
+            if first is second:
+                continue
+
+            merged = clusters[first] + clusters[second]
+            if not self.__feasible(np.sum([component.resource_vector for component in merged], axis=0)).any():
+                continue
+
+            if len(clusters[first]) < len(clusters[second]):
+                first, second = second, first
+            for component in clusters[second]:
+                cluster_of[component] = first
+            clusters[first] = merged
+            del clusters[second]
+
+        return list(clusters.values())
+
+    def __place_clusters(self, components):
+        clusters = [
+            (np.sum([component.resource_vector for component in cluster], axis=0), cluster)
+            for cluster in self.cluster(components)
+        ]
+        clusters.sort(key=lambda x: -np.sum(x[0]))
+        unplaced_components = []
+
+        for resource_vector, cluster in clusters:
+            server_index = self.__affinity(resource_vector, cluster, self.__feasible(resource_vector))
+            if server_index is not None:
+                for component in cluster:
+                    self.assign(component, server_index)
+                continue
+
+            for component in sorted(cluster, key=lambda x: -np.sum(x.resource_vector)):
+                server_index = self.select(component)
+                if server_index is None:
+                    unplaced_components.append(component)
+                else:
+                    self.assign(component, server_index)
+
+        return unplaced_components
+
+    def __affinity(self, resource_vector, cluster, feasible):
+        candidates = np.flatnonzero(feasible)
+        if len(candidates) == 0:
+            return None
+
+        node_traffic = dict()
+        for component in cluster:
+            for link_demand in self.component_demands[component]:
+                link = link_demand.link
+                other = link.end_component if link.start_component is component else link.start_component
+                if other.is_deployed_on_server() and other.server_id in self.server_index:
+                    node_id = self.server_nodes[self.server_index[other.server_id]]
+                    node_traffic[node_id] = node_traffic.get(node_id, 0) + link_demand.throughput
+
+        if len(node_traffic) > 0:
+            traffic = np.array([node_traffic.get(node_id, 0) for node_id in self.server_nodes[candidates]])
+            candidates = candidates[traffic == traffic.max()]
+
+        for preferred in (~self.inactive[candidates], self.node_active_servers[self.server_nodes[candidates]] > 0):
+            if preferred.any():
+                candidates = candidates[preferred]
+                break
+
+        slopes = self.power_slopes[candidates]
+        return int(candidates[np.argmin(slopes)])
+
+    def __feasible(self, resource_vector):
+        resource_vector = resource_vector - Server.tolerance
+        feasible = ~self.excluded
+        for resource in range(len(self.residuals)):
+            feasible &= self.residuals[resource] > resource_vector[resource]
+        return feasible
+
+    def __dot_product(self, resource_vector, feasible):
+        candidates = np.flatnonzero(feasible & ~self.inactive)
+        if len(candidates) == 0:
+            candidates = np.flatnonzero(feasible)
+            if len(candidates) == 0:
+                return None
+
+        slopes = self.power_slopes[candidates]
+        candidates = candidates[slopes == slopes.min()]
+        if len(candidates) == 1:
+            return int(candidates[0])
+
+        capacities = self.capacities[:, candidates]
+        residuals = self.residuals[:, candidates]
+        alignment = np.sum((resource_vector[:, None] / capacities) * (residuals / capacities), axis=0)
+        return int(candidates[np.argmax(alignment)])
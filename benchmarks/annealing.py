@@ -0,0 +1,76 @@
+from core.problem import Problem
+from algorithms.annealing import SimulatedAnnealing
+from algorithms.greedy import GreedyHeuristic
+import statistics
+import argparse
+import random
+import time
+
+
+def best_feasible_cost(problem, best_cost):
+    cost = problem.fitness()
+    if problem.constraint_service.is_feasible() and (best_cost is None or cost < best_cost):
+        return cost
+    return best_cost
+
+
+def run_annealing(problem, seed, iterations):
+    random.seed(seed)
+    problem.init()
+    start = time.perf_counter()
+
+    annealing = SimulatedAnnealing(problem, iterations=iterations)
+    annealing.deploy_components()
+    annealing.deploy_routes()
+
+    return best_feasible_cost(problem, None), time.perf_counter() - start
+
+
+def run_restarts(problem, seed, time_budget):
+    random.seed(seed)
+    best_cost, restarts = None, 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < time_budget:
+        problem.init()
+        greedy = GreedyHeuristic(problem)
+        greedy.deploy_components()
+        greedy.deploy_routes()
+        best_cost = best_feasible_cost(problem, best_cost)
+        restarts += 1
+
+    return best_cost, restarts
+
+
+def median(costs):
+    costs = [cost for cost in costs if cost is not None]
+    return statistics.median(costs) if len(costs) > 0 else None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Simulated annealing vs. greedy restarts in the same time.')
+    arg_parser.add_argument('--instance', default='data/instance.txt')
+    arg_parser.add_argument('--seeds', type=int, default=5)
+    arg_parser.add_argument('--iterations', type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    problem = Problem(file_path=args.instance)
+    problem.init()
+
+    annealing_costs, restart_costs = [], []
+    for seed in range(args.seeds):
+        annealing_cost, elapsed = run_annealing(problem, seed, args.iterations)
+        restart_cost, restarts = run_restarts(problem, seed, elapsed)
+        annealing_costs.append(annealing_cost)
+        restart_costs.append(restart_cost)
+
+        print('seed {0}: {1:.2f}s  annealing {2}  greedy restarts {3} ({4} restarts)'.format(
+            seed, elapsed, annealing_cost, restart_cost, restarts
+        ))
+
+    print('Median annealing:       {0}'.format(median(annealing_costs)))
+    print('Median greedy restarts: {0}'.format(median(restart_costs)))
+
+
+if __name__ == '__main__':
+    main()
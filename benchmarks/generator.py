@@ -0,0 +1,209 @@
+import numpy as np
+import argparse
+
+
+class InstanceGenerator(object):
+    topologies = ('fat_tree', 'random_geometric', 'ring')
+
+    def __init__(self, topology='fat_tree', size=4, servers=16, components=40, chains=10, demands=40, seed=0,
+                 radius=0.3):
+        assert topology in self.topologies, 'Topology should be one of {0}.'.format(self.topologies)
+        assert demands >= chains, 'Every service chain needs at least one demand.'
+        assert components >= 2 * chains, 'Every service chain needs at least two components.'
+
+        self.topology = topology
+        self.size = size
+        self.number_of_servers = servers
+        self.number_of_components = components
+        self.number_of_chains = chains
+        self.number_of_demands = demands
+        self.radius = radius
+        self.random = np.random.RandomState(seed)
+
+    def generate(self):
+        topology_factory = {
+            'fat_tree': self.__create_fat_tree,
+            'random_geometric': self.__create_random_geometric,
+            'ring': self.__create_ring
+        }
+        nodes, edges, server_nodes = topology_factory[self.topology]()
+
+        data = {
+            'numServers': self.number_of_servers,
+            'numVms': self.number_of_components,
+            'numRes': 2,
+            'numNodes': nodes,
+            'numServiceChains': self.number_of_chains
+        }
+
+        data.update(self.__create_servers(nodes, server_nodes))
+        data.update(self.__create_components(data['av']))
+        data.update(self.__create_chains_and_demands())
+        data['Edges'] = self.__create_edges(edges)
+        data['P'] = self.random.choice([220.0, 290.0, 350.0, 480.0, 600.0], nodes)
+        data['lat'] = self.__create_latencies(nodes, data['Edges'], server_nodes, data['sc'], data['VmDemands'])
+
+        return data
+
+    def __create_ring(self):
+        nodes = self.size
+        edges = [(i, (i + 1) % nodes) for i in range(nodes)]
+        return nodes, edges, list(range(nodes))
+
+    def __create_fat_tree(self):
+        k = self.size
+        assert k % 2 == 0 and k >= 2, 'Fat-tree arity should be an even number.'
+
+        half = k // 2
+        core = list(range(half * half))
+        aggregation = [len(core) + pod * half + i for pod in range(k) for i in range(half)]
+        edge = [len(core) + len(aggregation) + pod * half + i for pod in range(k) for i in range(half)]
+
+        edges = []
+        for pod in range(k):
+            for i in range(half):
+                aggregation_node = aggregation[pod * half + i]
+                edges.extend((aggregation_node, core[i * half + j]) for j in range(half))
+                edges.extend((aggregation_node, edge[pod * half + j]) for j in range(half))
+
+        return len(core) + len(aggregation) + len(edge), edges, edge
+
+    def __create_random_geometric(self):
+        nodes = self.size
+        points = self.random.uniform(size=(nodes, 2))
+        distances = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+
+        edges = set()
+        for i in range(nodes):
+            for j in range(i + 1, nodes):
+                if distances[i, j] < self.radius:
+                    edges.add((i, j))
+
+        for i in range(1, nodes):
+            nearest = int(np.argmin(distances[i, :i]))
+            edges.add((nearest, i))
+
+        return nodes, sorted(edges), list(range(nodes))
+
+    def __create_servers(self, nodes, server_nodes):
+        max_powers = self.random.choice([160.0, 190.0, 220.0, 260.0, 290.0], self.number_of_servers)
+        min_powers = np.round(max_powers * self.random.uniform(0.2, 0.4, self.number_of_servers))
+
+        locations = np.zeros((self.number_of_servers, nodes))
+        for server_id in range(self.number_of_servers):
+            locations[server_id, server_nodes[self.random.randint(len(server_nodes))]] = 1
+
+        resources = np.round(self.random.uniform(0.6, 3.2, (2, self.number_of_servers)), 1)
+        return {'P_max': max_powers, 'P_min': min_powers, 'al': locations, 'av': resources}
+
+    def __create_components(self, server_resources):
+        total_resources = server_resources.sum(axis=1, keepdims=True)
+        weights = self.random.uniform(0.5, 1.5, (2, self.number_of_components))
+        resources = np.round(0.5 * total_resources * weights / weights.sum(axis=1, keepdims=True), 2)
+
+        return {'req': np.maximum(resources, 0.01)}
+
+    def __create_chains_and_demands(self):
+        components = self.random.permutation(self.number_of_components)
+        chains = np.array_split(components, self.number_of_chains)
+
+        membership = np.zeros((self.number_of_chains, self.number_of_components))
+        pairs = []
+        for chain_id, chain in enumerate(chains):
+            membership[chain_id, chain] = 1
+            pairs.extend(zip(chain[:-1], chain[1:]))
+
+        self.random.shuffle(pairs)
+        while len(pairs) < self.number_of_demands:
+            chain = chains[self.random.randint(len(chains))]
+            first, second = self.random.choice(chain, 2, replace=False)
+            pairs.append((first, second))
+
+        demands = [
+            (first + 1, second + 1, self.random.choice([50, 100, 150, 200]))
+            for first, second in pairs[:self.number_of_demands]
+        ]
+
+        return {'sc': membership, 'VmDemands': np.array(demands, dtype=float)}
+
+    def __create_edges(self, edges):
+        return np.array([
+            (start + 1, end + 1, self.random.choice([550, 733, 1100]), self.random.choice([15.4, 25.4, 35.4]),
+             self.random.randint(1, 5))
+            for start, end in edges
+        ], dtype=float)
+
+    def __create_latencies(self, nodes, edges, server_nodes, membership, demands):
+        adjacency = [[] for _ in range(nodes)]
+        for start, end in edges[:, :2].astype(int) - 1:
+            adjacency[start].append(end)
+            adjacency[end].append(start)
+
+        diameter = 1
+        for server_node in set(server_nodes):
+            hops = {server_node: 0}
+            frontier = [server_node]
+            while len(frontier) > 0:
+                next_frontier = []
+                for node in frontier:
+                    for neighbour in adjacency[node]:
+                        if neighbour not in hops:
+                            hops[neighbour] = hops[node] + 1
+                            next_frontier.append(neighbour)
+                frontier = next_frontier
+
+            diameter = max([diameter] + [hops[node] for node in server_nodes if node in hops])
+
+        chain_demands = membership[:, demands[:, 0].astype(int) - 1].sum(axis=1)
+        return np.maximum(chain_demands, 1) * diameter * edges[:, 4].mean()
+
+
+class OplWriter(object):
+    integer_variables = ('numServers', 'numVms', 'numRes', 'numNodes', 'numServiceChains')
+    list_variables = ('P_max', 'P_min', 'P', 'lat')
+    matrix_variables = ('req', 'av', 'al', 'sc')
+    list_vector_variables = ('Edges', 'VmDemands')
+
+    def __init__(self, data):
+        self.data = data
+
+    def write(self, file_path):
+        with open(file_path, 'w') as output_file:
+            for var_name in self.integer_variables:
+                output_file.write('{0} = {1};\n'.format(var_name, self.data[var_name]))
+
+            for var_name in self.list_variables:
+                output_file.write('{0} = [{1}];\n'.format(var_name, self.__format_row(self.data[var_name])))
+
+            for var_name in self.matrix_variables:
+                rows = '\n'.join('[{0}]'.format(self.__format_row(row)) for row in self.data[var_name])
+                output_file.write('{0} = [\n{1}];\n'.format(var_name, rows))
+
+            for var_name in self.list_vector_variables:
+                vectors = ''.join('<{0}>,\n'.format(self.__format_row(row)) for row in self.data[var_name])
+                output_file.write('{0} = {{\n{1}}};\n'.format(var_name, vectors))
+
+    def __format_row(self, row):
+        return ','.join('{0:.10g}'.format(value) for value in row)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Generate a synthetic OPL instance.')
+    arg_parser.add_argument('output')
+    arg_parser.add_argument('--topology', default='fat_tree', choices=InstanceGenerator.topologies)
+    arg_parser.add_argument('--size', type=int, default=4)
+    arg_parser.add_argument('--servers', type=int, default=16)
+    arg_parser.add_argument('--components', type=int, default=40)
+    arg_parser.add_argument('--chains', type=int, default=10)
+    arg_parser.add_argument('--demands', type=int, default=40)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    generator = InstanceGenerator(
+        args.topology, args.size, args.servers, args.components, args.chains, args.demands, args.seed
+    )
+    OplWriter(generator.generate()).write(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+from core.problem import Problem
+from algorithms.greedy import GreedyHeuristic
+import argparse
+import time
+
+
+def run_restarts(problem, iterations, rebuild):
+    start = time.perf_counter()
+
+    for i in range(iterations):
+        if rebuild:
+            problem.reload()
+        else:
+            problem.init()
+
+        greedy = GreedyHeuristic(problem)
+        greedy.deploy_components()
+        greedy.deploy_routes()
+        problem.fitness()
+
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Restart loop throughput: full rebuild vs. state reset.')
+    arg_parser.add_argument('--instance', default='data/instance.txt')
+    arg_parser.add_argument('--iterations', type=int, default=200)
+    args = arg_parser.parse_args()
+
+    problem = Problem(file_path=args.instance)
+    problem.init()
+
+    rebuild_rate = run_restarts(problem, args.iterations, rebuild=True)
+    reset_rate = run_restarts(problem, args.iterations, rebuild=False)
+
+    print('Parse and build every iteration: {0:.1f} it/s'.format(rebuild_rate))
+    print('Reset mutable state only:        {0:.1f} it/s'.format(reset_rate))
+    print('Speedup: {0:.2f}x'.format(reset_rate / rebuild_rate))
+
+
+if __name__ == '__main__':
+    main()
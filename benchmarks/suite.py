@@ -0,0 +1,118 @@
+from benchmarks.generator import InstanceGenerator, OplWriter
+from core.grid import GridFactory
+from core.parser import Parser
+from core.problem import Problem
+from algorithms.greedy import GreedyHeuristic
+import statistics
+import argparse
+import tempfile
+import random
+import json
+import time
+import csv
+import os
+
+scales = {
+    'small': dict(topology='ring', size=8, servers=28, components=44, chains=12, demands=60),
+    'medium': dict(topology='fat_tree', size=4, servers=64, components=200, chains=40, demands=300),
+    'large': dict(topology='random_geometric', size=40, servers=256, components=1000, chains=150, demands=1500),
+    'xlarge': dict(topology='fat_tree', size=8, servers=1024, components=5000, chains=600, demands=8000)
+}
+
+
+class BenchmarkSuite(object):
+
+    def __init__(self, scale_names, repeats=5, seed=0, packing='dot_product'):
+        for scale_name in scale_names:
+            assert scale_name in scales, 'Unknown scale {0}.'.format(scale_name)
+
+        self.scale_names = scale_names
+        self.repeats = repeats
+        self.seed = seed
+        self.packing = packing
+        self.results = []
+
+    def run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for scale_name in self.scale_names:
+                file_path = os.path.join(directory, '{0}.txt'.format(scale_name))
+                OplWriter(InstanceGenerator(seed=self.seed, **scales[scale_name]).generate()).write(file_path)
+                self.__run_scale(scale_name, file_path)
+
+        return self.results
+
+    def __run_scale(self, scale_name, file_path):
+        parser = Parser(file_path)
+        self.__measure(scale_name, 'Parser.parse', lambda: Parser(file_path).parse())
+        parser.parse()
+        data = parser.get_parsed_data()
+
+        self.__measure(scale_name, 'GridFactory.create_grid', lambda: GridFactory(data).create_grid())
+
+        problem = Problem(file_path)
+        problem.build(data)
+        random.seed(self.seed)
+
+        def deploy_components():
+            problem.init()
+            GreedyHeuristic(problem, self.packing).deploy_components()
+
+        def deploy_routes():
+            for link_demand in problem.grid.link_demands:
+                if len(link_demand.link.nodes) > 0:
+                    problem.grid.remove_link_route(link_demand.link, link_demand.throughput)
+            GreedyHeuristic(problem).deploy_routes()
+
+        self.__measure(scale_name, 'GreedyHeuristic.deploy_components', deploy_components)
+        self.__measure(scale_name, 'GreedyHeuristic.deploy_routes', deploy_routes)
+        self.__measure(scale_name, 'Problem.fitness', problem.fitness)
+        self.__measure(scale_name, 'ConstraintService.check_all', problem.constraint_service.check_all)
+
+    def __measure(self, scale_name, name, function):
+        timings = []
+        for i in range(self.repeats):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+
+        result = {
+            'scale': scale_name,
+            'benchmark': name,
+            'repeats': self.repeats,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.mean(timings),
+            'max': max(timings)
+        }
+        self.results.append(result)
+        print('{0:8} {1:36} median {2:10.6f}s  min {3:10.6f}s'.format(
+            scale_name, name, result['median'], result['min']
+        ))
+
+    def write(self, file_path):
+        if file_path.endswith('.csv'):
+            with open(file_path, 'w', newline='') as output_file:
+                writer = csv.DictWriter(output_file, fieldnames=list(self.results[0].keys()))
+                writer.writeheader()
+                writer.writerows(self.results)
+        else:
+            with open(file_path, 'w') as output_file:
+                json.dump({'seed': self.seed, 'results': self.results}, output_file, indent=2)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Time the solve pipeline on generated instances.')
+    arg_parser.add_argument('--scales', nargs='+', default=['small', 'medium', 'large'], choices=sorted(scales))
+    arg_parser.add_argument('--repeats', type=int, default=5)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--packing', default='dot_product', choices=GreedyHeuristic.packings)
+    arg_parser.add_argument('--output', default='benchmark_results.json', help='.json or .csv')
+    args = arg_parser.parse_args()
+
+    suite = BenchmarkSuite(args.scales, args.repeats, args.seed, args.packing)
+    suite.run()
+    suite.write(args.output)
+
+
+if __name__ == '__main__':
+    main()
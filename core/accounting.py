@@ -0,0 +1,139 @@
+
+class UsageLedger(object):
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rebuild()
+
+    def rebuild(self):
+        self.edge_link_count = dict()
+        self.node_route_count = [0] * len(self.grid.nodes)
+        self.node_active_servers = [0] * len(self.grid.nodes)
+        self.server_resources_used = [0] * len(self.grid.servers)
+        self.server_power = [0] * len(self.grid.servers)
+        self.edges_power = 0
+        self.nodes_power = 0
+        self.servers_power = 0
+        self.active_servers, self.server_positions = [], dict()
+        self.active_server_nodes, self.node_positions = [], dict()
+
+        for server in self.grid.servers:
+            if server.is_active():
+                resources_used = sum([component.resources_needed for component in server.components])
+                self.__set_server_resources(server, resources_used, len(server.components))
+                self.__activate_server(server)
+
+        for link_demand in self.grid.link_demands:
+            link = link_demand.link
+            if len(link.nodes) > 0:
+                self.on_route_added(link, link.nodes, link.edges, link_demand.throughput)
+
+    def total_power(self):
+        return self.edges_power + self.nodes_power + self.servers_power
+
+    def is_active_edge(self, edge):
+        return self.edge_link_count.get(edge, 0) > 0
+
+    def is_active_node(self, node):
+        return self.__is_active_node_id(node.node_id)
+
+    def __is_active_node_id(self, node_id):
+        return self.node_route_count[node_id] > 0 or self.node_active_servers[node_id] > 0
+
+    def __update_node_power(self, node_id, was_active):
+        is_active = self.__is_active_node_id(node_id)
+
+        if is_active and not was_active:
+            self.nodes_power += self.grid.nodes[node_id].power_usage
+        elif was_active and not is_active:
+            self.nodes_power -= self.grid.nodes[node_id].power_usage
+
+    def __set_server_resources(self, server, resources_used, component_count):
+        server_id = server.server_id
+
+        if component_count > 0:
+            average_server_power = (server.max_power - server.min_power) / server.max_resources
+            power = server.min_power + average_server_power * resources_used
+        else:
+            power = 0
+
+        self.servers_power += power - self.server_power[server_id]
+        self.server_power[server_id] = power
+        self.server_resources_used[server_id] = resources_used
+
+    def __activate_server(self, server):
+        was_active = self.__is_active_node_id(server.node_id)
+        self.node_active_servers[server.node_id] += 1
+        self.__update_node_power(server.node_id, was_active)
+
+        self.__insert(self.active_servers, self.server_positions, server)
+        if self.node_active_servers[server.node_id] == 1:
+            self.__insert(self.active_server_nodes, self.node_positions, self.grid.nodes[server.node_id])
+
+    def __deactivate_server(self, server):
+        was_active = self.__is_active_node_id(server.node_id)
+        self.node_active_servers[server.node_id] -= 1
+        self.__update_node_power(server.node_id, was_active)
+
+        self.__remove(self.active_servers, self.server_positions, server)
+        if self.node_active_servers[server.node_id] == 0:
+            self.__remove(self.active_server_nodes, self.node_positions, self.grid.nodes[server.node_id])
+
+    @staticmethod
+    def __insert(items, positions, item):
+        positions[item] = len(items)
+        items.append(item)
+
+    @staticmethod
+    def __remove(items, positions, item):
+        position = positions.pop(item)
+        last_item = items.pop()
+        if position < len(items):
+            items[position] = last_item
+            positions[last_item] = position
+
+    def on_component_added(self, server, component):
+        resources_used = self.server_resources_used[server.server_id] + component.resources_needed
+        self.__set_server_resources(server, resources_used, len(server.components))
+
+        if len(server.components) == 1:
+            self.__activate_server(server)
+
+    def on_component_removed(self, server, component):
+        resources_used = self.server_resources_used[server.server_id] - component.resources_needed
+        self.__set_server_resources(server, resources_used, len(server.components))
+
+        if len(server.components) == 0:
+            self.__deactivate_server(server)
+
+    def on_route_added(self, link, nodes, edges, throughput):
+        for edge in edges:
+            count = self.edge_link_count.get(edge, 0)
+            self.edge_link_count[edge] = count + 1
+            if count == 0:
+                self.edges_power += edge.power_usage
+
+        for node in nodes:
+            was_active = self.__is_active_node_id(node.node_id)
+            self.node_route_count[node.node_id] += 1
+            self.__update_node_power(node.node_id, was_active)
+
+    def on_route_removed(self, link, nodes, edges, throughput):
+        for edge in edges:
+            count = self.edge_link_count[edge] - 1
+            if count == 0:
+                del self.edge_link_count[edge]
+                self.edges_power -= edge.power_usage
+            else:
+                self.edge_link_count[edge] = count
+
+        for node in nodes:
+            was_active = self.__is_active_node_id(node.node_id)
+            self.node_route_count[node.node_id] -= 1
+            self.__update_node_power(node.node_id, was_active)
+
+    def on_service_chain_added(self, service_chain, components, link_demands):
+        pass
+
+    def on_service_chain_removed(self, service_chain, components, link_demands):
+        pass
@@ -0,0 +1,138 @@
+from core.binary import BinaryInstance
+from core.problem import Problem, ReaderService, WriterService
+import numpy as np
+import argparse
+import hashlib
+import json
+import time
+import os
+
+
+class SolutionArchive(object):
+    index_name = 'index.json'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.entries = dict()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        index_path = os.path.join(directory, self.index_name)
+        if os.path.exists(index_path):
+            with open(index_path) as index_file:
+                self.entries = {entry['hash']: entry for entry in json.load(index_file)}
+
+    @staticmethod
+    def placement_hash(placement):
+        placement = np.array([-1 if server_id is None else server_id for server_id in placement], dtype='<i8')
+        return hashlib.sha1(placement.tobytes()).hexdigest()
+
+    def add(self, placement, routes, cost, seed=None, algorithm=None, timings=None, feasible=None):
+        solution_hash = self.placement_hash(placement)
+        entry = self.entries.get(solution_hash)
+        if entry is not None and entry['cost'] <= cost:
+            return None
+
+        file_name = '{0}.bin'.format(solution_hash)
+        self.write(os.path.join(self.directory, file_name), placement, routes)
+
+        self.entries[solution_hash] = {
+            'hash': solution_hash,
+            'cost': float(cost),
+            'seed': seed,
+            'algorithm': algorithm,
+            'feasible': feasible,
+            'timings': timings if timings is not None else dict(),
+            'created': time.time(),
+            'file': file_name
+        }
+        self.save()
+
+        return self.entries[solution_hash]
+
+    def add_grid(self, grid, cost=None, seed=None, algorithm=None, timings=None, feasible=None):
+        cost = grid.ledger.total_power() if cost is None else cost
+        return self.add(
+            *grid.dump_solution(), cost=cost, seed=seed, algorithm=algorithm, timings=timings, feasible=feasible
+        )
+
+    def save(self):
+        index_path = os.path.join(self.directory, self.index_name)
+        with open(index_path + '.tmp', 'w') as index_file:
+            json.dump(self.ranked(), index_file, indent=2)
+        os.replace(index_path + '.tmp', index_path)
+
+    def ranked(self):
+        return sorted(self.entries.values(), key=lambda x: x['cost'])
+
+    def best(self, feasible_only=True):
+        ranked = [entry for entry in self.ranked() if not feasible_only or entry['feasible']]
+        return ranked[0] if len(ranked) > 0 else None
+
+    def read(self, entry):
+        entry = self.entries[entry] if isinstance(entry, str) else entry
+        return self.read_file(os.path.join(self.directory, entry['file']))
+
+    def load(self, entry, grid):
+        grid.load_solution(*self.read(entry))
+        return grid
+
+    @staticmethod
+    def write(file_path, placement, routes):
+        BinaryInstance.write({
+            'placement': np.array([-1 if server_id is None else server_id for server_id in placement], dtype=np.int64),
+            'route_lengths': np.array([len(route) for route in routes], dtype=np.int64),
+            'route_nodes': np.array([node_id for route in routes for node_id in route], dtype=np.int64)
+        }, file_path)
+
+    @staticmethod
+    def read_file(file_path, problem=None):
+        if not BinaryInstance.is_binary(file_path):
+            assert problem is not None, 'Reading a text solution needs the problem it belongs to.'
+            return ReaderService(problem).read(file_path)
+
+        data = BinaryInstance.read(file_path)
+        placement = [None if server_id == -1 else int(server_id) for server_id in data['placement']]
+        offsets = np.concatenate(([0], np.cumsum(data['route_lengths'])))
+        route_nodes = data['route_nodes'].tolist()
+        routes = [route_nodes[offsets[i]:offsets[i + 1]] for i in range(len(data['route_lengths']))]
+
+        return placement, routes
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Manage the solution archive.')
+    arg_parser.add_argument('command', choices=['import', 'list', 'export'])
+    arg_parser.add_argument('paths', nargs='*', help='text solutions to import or the output path for export')
+    arg_parser.add_argument('--archive', default='solutions/archive')
+    arg_parser.add_argument('--instance', default='data/instance.txt')
+    args = arg_parser.parse_args()
+
+    archive = SolutionArchive(args.archive)
+
+    if args.command == 'list':
+        for entry in archive.ranked():
+            print('{0:.4f} {1} {2} seed={3} feasible={4}'.format(
+                entry['cost'], entry['hash'], entry['algorithm'], entry['seed'], entry['feasible']
+            ))
+        return
+
+    problem = Problem(args.instance)
+    problem.init()
+
+    if args.command == 'import':
+        for path in args.paths:
+            problem.grid.load_solution(*SolutionArchive.read_file(path, problem))
+            entry = archive.add_grid(
+                problem.grid, algorithm='import:{0}'.format(os.path.basename(path)),
+                feasible=problem.constraint_service.is_feasible()
+            )
+            print('{0} {1}'.format(path, 'duplicate' if entry is None else (entry['cost'], entry['feasible'])))
+    else:
+        archive.load(archive.best(), problem.grid)
+        WriterService(problem).write(args.paths[0] if len(args.paths) > 0 else None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+import numpy as np
+
+
+class GridArrays(object):
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.revision = grid.revision
+
+        self.server_node = np.array([server.node_id for server in grid.servers], dtype=np.int64)
+        self.server_min_power = np.array([server.min_power for server in grid.servers], dtype=float)
+        self.server_max_power = np.array([server.max_power for server in grid.servers], dtype=float)
+        self.server_resources = np.array([server.max_resources for server in grid.servers], dtype=float)
+        self.server_power_slope = (self.server_max_power - self.server_min_power) / self.server_resources
+        self.server_capacity = np.array([server.resources_available for server in grid.servers], dtype=float)
+
+        self.node_power = np.array([node.power_usage for node in grid.nodes], dtype=float)
+        self.component_resources = np.array([component.resources_needed for component in grid.components], dtype=float)
+        self.component_demand = np.array([component.resource_vector for component in grid.components], dtype=float)
+
+        self.edge_index = {edge: i for i, edge in enumerate(grid.edges)}
+        self.edge_power = np.array([edge.power_usage for edge in grid.edges], dtype=float)
+        self.edge_capacity = np.array([edge.capacity for edge in grid.edges], dtype=float)
+        self.edge_delay = np.array([edge.delay for edge in grid.edges], dtype=float)
+        self.edge_start_node = np.array([edge.start_node.node_id for edge in grid.edges], dtype=np.int64)
+        self.edge_end_node = np.array([edge.end_node.node_id for edge in grid.edges], dtype=np.int64)
+
+        links = [link_demand.link for link_demand in grid.link_demands]
+        self.link_index = {link: i for i, link in enumerate(links)}
+        self.demand_start = np.array([link.start_component.component_id for link in links], dtype=np.int64)
+        self.demand_end = np.array([link.end_component.component_id for link in links], dtype=np.int64)
+        self.demand_throughput = np.array([demand.throughput for demand in grid.link_demands], dtype=float)
+
+        self.chain_max_delay = np.array([chain.max_delay for chain in grid.service_chains], dtype=float)
+        self.chain_demands = np.zeros((len(grid.service_chains), len(links)), dtype=float)
+        for i, service_chain in enumerate(grid.service_chains):
+            for link in service_chain.links:
+                self.chain_demands[i, self.link_index[link]] = 1
+
+    def dimensions(self):
+        return len(self.server_node), len(self.component_resources), len(self.node_power), len(self.edge_power)
+
+
+class IncidenceMatrix(object):
+
+    def __init__(self, indptr, indices, shape):
+        assert len(indptr) == shape[0] + 1, 'Index pointer should have one entry per row plus one.'
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.shape = shape
+
+    @staticmethod
+    def from_rows(rows, number_of_columns):
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.concatenate([np.asarray(row, dtype=np.int64) for row in rows]) if len(rows) > 0 else []
+
+        return IncidenceMatrix(indptr, indices, (len(rows), number_of_columns))
+
+    def row_lengths(self):
+        return np.diff(self.indptr)
+
+
+class RouteTable(object):
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.grid = arrays.grid
+        self.k = self.grid.route_cache.k
+
+        number_of_nodes = len(arrays.node_power)
+        self.pair_offset = np.full(number_of_nodes * number_of_nodes, -1, dtype=np.int64)
+        self.pair_routes = np.zeros(number_of_nodes * number_of_nodes, dtype=np.int64)
+        self.node_routes = []
+        self.edge_routes = []
+        self.routes = IncidenceMatrix.from_rows([], len(arrays.edge_power))
+
+    def pair_ids(self, start_nodes, end_nodes):
+        return start_nodes * len(self.arrays.node_power) + end_nodes
+
+    def ensure(self, pair_ids):
+        pair_ids = np.unique(pair_ids)
+        missing = pair_ids[self.pair_offset[pair_ids] == -1]
+        if len(missing) == 0:
+            return
+
+        number_of_nodes = len(self.arrays.node_power)
+        for pair_id in missing:
+            start_node = self.grid.nodes[pair_id // number_of_nodes]
+            end_node = self.grid.nodes[pair_id % number_of_nodes]
+            routes = self.grid.route_cache.get_routes(start_node, end_node) if start_node is not end_node else []
+
+            self.pair_offset[pair_id] = len(self.node_routes)
+            self.pair_routes[pair_id] = len(routes)
+            for route in routes:
+                self.node_routes.append([node.node_id for node in route])
+                self.edge_routes.append([
+                    self.arrays.edge_index[self.grid.get_edge(route[i - 1], route[i])] for i in range(1, len(route))
+                ])
+
+        self.routes = IncidenceMatrix.from_rows(self.edge_routes, len(self.arrays.edge_power))
+
+    def route_ids(self, pair_ids, choices):
+        self.ensure(pair_ids)
+        counts = self.pair_routes[pair_ids]
+        return np.where(counts > 0, self.pair_offset[pair_ids] + choices % np.maximum(counts, 1), -1)
+
+
+class BatchEvaluator(object):
+    constraint_names = ('components', 'servers', 'edges', 'service_chains', 'link_demands')
+
+    def __init__(self, arrays, route_table=None):
+        self.arrays = arrays
+        self.route_table = RouteTable(arrays) if route_table is None else route_table
+
+    def encode(self, grid):
+        placement = np.array(
+            [-1 if component.server_id is None else component.server_id for component in grid.components],
+            dtype=np.int64
+        )
+        choices = np.zeros(len(grid.link_demands), dtype=np.int64)
+
+        for i, link_demand in enumerate(grid.link_demands):
+            nodes = link_demand.link.nodes
+            if len(nodes) > 0:
+                routes = grid.route_cache.get_routes(nodes[0], nodes[-1])
+                choices[i] = routes.index(nodes) if nodes in routes else 0
+
+        return placement, choices
+
+    def decode(self, placement, choices):
+        arrays = self.arrays
+        component_nodes = np.where(placement > -1, arrays.server_node[placement], -1)
+        start_nodes, end_nodes = component_nodes[arrays.demand_start], component_nodes[arrays.demand_end]
+
+        needs_route = (start_nodes > -1) & (end_nodes > -1) & (start_nodes != end_nodes)
+        route_ids = np.full(len(choices), -1, dtype=np.int64)
+        route_ids[needs_route] = self.route_table.route_ids(
+            self.route_table.pair_ids(start_nodes[needs_route], end_nodes[needs_route]), choices[needs_route]
+        )
+
+        placement = [None if server_id == -1 else int(server_id) for server_id in placement]
+        routes = [[] if route_id == -1 else self.route_table.node_routes[route_id] for route_id in route_ids]
+        return placement, routes
+
+    def evaluate(self, placements, choices):
+        arrays = self.arrays
+        placements = np.asarray(placements, dtype=np.int64)
+        choices = np.asarray(choices, dtype=np.int64)
+        assert placements.ndim == 2, 'Placements should be a (population, components) matrix.'
+        assert choices.shape == (len(placements), len(arrays.demand_throughput)), \
+            'Route choices should be a (population, demands) matrix.'
+
+        population, number_of_demands = choices.shape
+        number_of_servers, number_of_components, number_of_nodes, number_of_edges = arrays.dimensions()
+
+        deployed = placements > -1
+        candidate_ids = np.repeat(np.arange(population), number_of_components)
+        server_slots = (candidate_ids * number_of_servers + placements.ravel())[deployed.ravel()]
+
+        loads = np.stack([
+            np.bincount(
+                server_slots, weights=np.tile(arrays.component_demand[:, resource], population)[deployed.ravel()],
+                minlength=population * number_of_servers
+            ) for resource in range(arrays.component_demand.shape[1])
+        ], axis=1).reshape(population, number_of_servers, -1)
+        active_servers = np.bincount(server_slots, minlength=population * number_of_servers).reshape(
+            population, number_of_servers
+        ) > 0
+
+        component_nodes = np.where(deployed, arrays.server_node[np.maximum(placements, 0)], -1)
+        start_nodes, end_nodes = component_nodes[:, arrays.demand_start], component_nodes[:, arrays.demand_end]
+        same_node = (start_nodes == end_nodes) & (start_nodes > -1)
+        needs_route = (start_nodes > -1) & (end_nodes > -1) & ~same_node
+
+        route_ids = np.full(choices.shape, -1, dtype=np.int64)
+        route_ids[needs_route] = self.route_table.route_ids(
+            self.route_table.pair_ids(start_nodes[needs_route], end_nodes[needs_route]), choices[needs_route]
+        )
+
+        routed = route_ids > -1
+        route_table = self.route_table.routes
+        route_candidates, route_demands = np.nonzero(routed)
+        lengths = route_table.row_lengths()[route_ids[routed]]
+        starts = route_table.indptr[route_ids[routed]]
+        entry_ids = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        route_edges = route_table.indices[entry_ids]
+        edge_candidates = np.repeat(route_candidates, lengths)
+        edge_demands = np.repeat(route_demands, lengths)
+
+        edge_slots = edge_candidates * number_of_edges + route_edges
+        throughputs = np.bincount(
+            edge_slots, weights=arrays.demand_throughput[edge_demands], minlength=population * number_of_edges
+        ).reshape(population, number_of_edges)
+        active_edges = np.bincount(edge_slots, minlength=population * number_of_edges).reshape(
+            population, number_of_edges
+        ) > 0
+
+        demand_delays = np.bincount(
+            edge_candidates * number_of_demands + edge_demands, weights=arrays.edge_delay[route_edges],
+            minlength=population * number_of_demands
+        ).reshape(population, number_of_demands)
+        chain_delays = demand_delays.dot(arrays.chain_demands.T)
+
+        active_nodes = np.zeros((population, number_of_nodes), dtype=bool)
+        server_candidates, server_ids = np.nonzero(active_servers)
+        active_nodes[server_candidates, arrays.server_node[server_ids]] = True
+        active_nodes[edge_candidates, arrays.edge_start_node[route_edges]] = True
+        active_nodes[edge_candidates, arrays.edge_end_node[route_edges]] = True
+
+        server_power = arrays.server_min_power + arrays.server_power_slope * loads[:, :, 0]
+        fitness = active_edges.dot(arrays.edge_power) + active_nodes.dot(arrays.node_power) + \
+            np.where(active_servers, server_power, 0).sum(axis=1)
+
+        violations = np.stack([
+            (~deployed).sum(axis=1),
+            np.any(loads > arrays.server_capacity, axis=2).sum(axis=1),
+            (throughputs > arrays.edge_capacity).sum(axis=1),
+            (chain_delays >= arrays.chain_max_delay).sum(axis=1),
+            (~(routed | same_node)).sum(axis=1)
+        ], axis=1)
+
+        return fitness, violations
@@ -0,0 +1,73 @@
+import numpy as np
+import json
+
+
+class BinaryInstance(object):
+    magic = b'VNFPBIN1'
+    alignment = 64
+
+    @staticmethod
+    def is_binary(file_path):
+        with open(file_path, 'rb') as binary_file:
+            return binary_file.read(len(BinaryInstance.magic)) == BinaryInstance.magic
+
+    @staticmethod
+    def write(data, file_path):
+        header = {'scalars': dict(), 'arrays': dict()}
+        arrays = []
+
+        offset = 0
+        for var_name, var_content in data.items():
+            if isinstance(var_content, np.ndarray):
+                array = np.ascontiguousarray(var_content, dtype=var_content.dtype.newbyteorder('<'))
+                header['arrays'][var_name] = {
+                    'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset
+                }
+                arrays.append(array)
+                offset = BinaryInstance.__align(offset + array.nbytes)
+            else:
+                value = var_content.item() if isinstance(var_content, np.generic) else var_content
+                assert isinstance(value, (int, float)), '{0} should be a number or an array.'.format(var_name)
+                header['scalars'][var_name] = value
+
+        header_bytes = json.dumps(header).encode('utf-8')
+        data_start = BinaryInstance.__align(len(BinaryInstance.magic) + 8 + len(header_bytes))
+
+        with open(file_path, 'wb') as binary_file:
+            binary_file.write(BinaryInstance.magic)
+            binary_file.write(np.array([len(header_bytes)], dtype='<u8').tobytes())
+            binary_file.write(header_bytes)
+
+            for var_name, array in zip(header['arrays'], arrays):
+                binary_file.seek(data_start + header['arrays'][var_name]['offset'])
+                binary_file.write(array.tobytes())
+
+    @staticmethod
+    def read(file_path):
+        with open(file_path, 'rb') as binary_file:
+            assert binary_file.read(len(BinaryInstance.magic)) == BinaryInstance.magic, \
+                '{0} is not a binary instance file.'.format(file_path)
+            header_length = int(np.frombuffer(binary_file.read(8), dtype='<u8')[0])
+            header = json.loads(binary_file.read(header_length).decode('utf-8'))
+
+        data_start = BinaryInstance.__align(len(BinaryInstance.magic) + 8 + header_length)
+        data = dict(header.get('integers', dict()))
+        data.update(header.get('scalars', dict()))
+
+        for var_name, description in header['arrays'].items():
+            shape = tuple(description['shape'])
+            if 0 in shape:
+                data[var_name] = np.empty(shape, dtype=description['dtype'])
+                continue
+
+            data[var_name] = np.memmap(
+                file_path, dtype=description['dtype'], mode='r', offset=data_start + description['offset'],
+                shape=shape
+            )
+
+        return data
+
+    @staticmethod
+    def __align(offset):
+        alignment = BinaryInstance.alignment
+        return (offset + alignment - 1) // alignment * alignment
@@ -1,4 +1,5 @@
 from utils.exceptions import OutOfCapacityException
+import numpy as np
 
 
 class Edge(object):
@@ -28,9 +29,16 @@ class Edge(object):
 
         self.capacity_used += capacity
 
+    def remove_capacity(self, capacity):
+        assert capacity <= self.capacity_used, 'Can not release more capacity than is used.'
+        self.capacity_used -= capacity
+
     def is_active(self):
         return self.capacity_used > 0
 
+    def reset(self):
+        self.capacity_used = 0
+
     def __str__(self):
         return 'Start_node: {0}, end_node: {1}, delay: {2}, capacity: {3}, power_usage: {4}'.format(
             self.start_node, self.end_node, self.delay, self.capacity, self.power_usage
@@ -47,6 +55,8 @@ class Link(object):
         self.end_component = end_component
         self.edges = []
         self.nodes = []
+        self.delay = 0
+        self.service_chains = []
 
     def add_route(self, nodes):
         for node in nodes:
@@ -56,6 +66,14 @@ class Link(object):
     def clear_route(self):
         self.nodes = []
 
+    def reset(self):
+        self.nodes = []
+        self.edges = []
+        self.delay = 0
+
+    def get_delay_budget(self):
+        return min([service_chain.get_remaining_delay() for service_chain in self.service_chains] or [float('inf')])
+
     def has_edge(self, edge):
         assert isinstance(edge, Edge), 'Edge should be an instance of Edge.'
         return edge in self.edges
@@ -93,14 +111,24 @@ class ServiceChain(object):
         self.components = components
         self.max_delay = max_delay
         self.links = []
+        self.delay = 0
+
+    def add_link(self, link):
+        assert isinstance(link, Link), 'Link should be an instance of Link.'
+        self.links.append(link)
+        link.service_chains.append(self)
+
+    def add_delay(self, delay):
+        self.delay += delay
+
+    def reset(self):
+        self.delay = 0
 
     def get_delay(self):
-        delay = 0
-        for link in self.links:
-            for edge in link.edges:
-                delay += edge.delay
+        return self.delay
 
-        return delay
+    def get_remaining_delay(self):
+        return self.max_delay - self.delay
 
     def link_delays_are_within_max_delay(self):
         return self.max_delay > self.get_delay()
@@ -132,14 +160,19 @@ class Node(object):
 
 
 class Server(object):
+    tolerance = 1e-9
 
     def __init__(self, server_id, node_id, min_power, max_power, resources_available):
         assert max_power > min_power, 'Max power should be higher then min power.'
         assert node_id > -1, 'Node ID should be a greater then -1.'
 
         self.components = []
+        self.observer = None
         self.server_id = server_id
-        self.max_resources = resources_available
+        self.resources_available = np.atleast_1d(np.array(resources_available, dtype=float))
+        self.residual_resources = self.resources_available.copy()
+        self.resources_used = np.zeros_like(self.resources_available)
+        self.max_resources = self.resources_available[0]
         self.node_id = node_id
         self.min_power = min_power
         self.max_power = max_power
@@ -150,31 +183,52 @@ class Server(object):
         return len(self.components) > 0
 
     def __has_needed_resources(self):
-        resources_needed = sum([component.resources_needed() for component in self.components])
-        return resources_needed < self.max_resources
+        resources_needed = sum([component.resource_vector for component in self.components])
+        return np.all(resources_needed < self.resources_available)
 
     def number_of_components(self):
         return len(self.components)
 
+    def reset(self):
+        self.components = []
+        self.residual_resources = self.resources_available.copy()
+        self.resources_used = np.zeros_like(self.resources_available)
+
     def add_component(self, component):
         assert isinstance(component, Component), 'Component should be an instance of Component'
         component.add_server_id(server_id=self.server_id)
         self.components.append(component)
+        self.resources_used += component.resource_vector
+        self.residual_resources = self.resources_available - self.resources_used
+
+        if self.observer is not None:
+            self.observer.on_component_added(self, component)
+
+    def remove_component(self, component):
+        assert component.server_id == self.server_id, 'Component is not deployed on this server.'
+        self.components.remove(component)
+        self.resources_used -= component.resource_vector
+        self.residual_resources = self.resources_available - self.resources_used
+        component.reset()
+
+        if self.observer is not None:
+            self.observer.on_component_removed(self, component)
 
     def add_components(self, components):
         for component in components:
             self.add_component(component)
 
     def is_using_more_resources_then_available(self):
-        resources_used = sum([component.resources_needed for component in self.components])
-        return resources_used > self.max_resources
+        return np.any(self.resources_used > self.resources_available + self.tolerance)
 
     def get_available_resources(self):
-        resources_used = sum([component.resources_needed for component in self.components])
-        available_resources = self.max_resources - resources_used
+        return self.residual_resources.copy()
 
-        assert available_resources >= 0, 'Server can not use more resources than is has.'
-        return available_resources
+    def fits(self, resources):
+        return np.all(self.residual_resources > resources - self.tolerance)
+
+    def can_host(self, component):
+        return self.fits(component.resource_vector)
 
     def __str__(self):
         return 'ID: {0}, active: {1}, min_power: {2}, max_power: {3}, res_available: {4}'.format(
@@ -185,7 +239,8 @@ class Server(object):
 class Component(object):
 
     def __init__(self, resources_needed, component_id=None, server_id=None):
-        self.resources_needed = resources_needed
+        self.resource_vector = np.atleast_1d(np.array(resources_needed, dtype=float))
+        self.resources_needed = self.resource_vector[0]
         self.server_id = server_id
         self.component_id = component_id
 
@@ -199,5 +254,8 @@ class Component(object):
     def is_deployed_on_server(self):
         return self.server_id is not None
 
+    def reset(self):
+        self.server_id = None
+
     def __str__(self):
         return 'ser_id: {0}, res_need: {1}'.format(self.server_id + 1, self.resources_needed)
@@ -1,5 +1,9 @@
 from core.entities import Component, ServiceChain, LinkDemand, Link, Edge, Node, Server
+from core.accounting import UsageLedger
+from core.routes import RouteCache, ResidualGraph
+from core.transactions import ChangeLog
 from utils.exceptions import OutOfCapacityException
+from utils.instrumentation import instrumentation, timed
 import numpy as np
 
 
@@ -9,6 +13,7 @@ class GridFactory(object):
         self.data = data
         self.grid = None
 
+    @timed('grid_build')
     def create_grid(self):
         servers = self.__create_servers(self.data)
         components = self.__create_components(self.data)
@@ -22,12 +27,12 @@ class GridFactory(object):
     def __create_servers(self, data):
         min_powers = data['P_min']
         max_powers = data['P_max']
-        servers_available_resources = data['av']
+        servers_available_resources = np.atleast_2d(data['av'])
         node_server_location = data['al']
 
         servers = []
         server_id = 0
-        for min_power, max_power, available_resources in zip(min_powers, max_powers, servers_available_resources[0]):
+        for min_power, max_power in zip(min_powers, max_powers):
             node_id = np.argmax(node_server_location[server_id])
 
             server = Server(
@@ -35,7 +40,7 @@ class GridFactory(object):
                 node_id=node_id,
                 min_power=min_power,
                 max_power=max_power,
-                resources_available=available_resources
+                resources_available=servers_available_resources[:, server_id]
             )
 
             server_id += 1
@@ -45,20 +50,19 @@ class GridFactory(object):
 
     def __create_service_chains(self, data, components):
         service_chains = []
-        for service_chain, service_chain_delay in zip(data['sc'], data['lat']):
-            service_chain_components = [components[int(component_id) - 1] for component_id in service_chain]
+        for service_chain, service_chain_delay in zip(np.atleast_2d(data['sc']), data['lat']):
+            service_chain_components = [components[component_id] for component_id in np.flatnonzero(service_chain)]
             service_chain = ServiceChain(service_chain_components, service_chain_delay)
             service_chains.append(service_chain)
 
         return service_chains
 
     def __create_components(self, data):
-        resources_needed = data['req']
-        processor_resources_needed = resources_needed[0]
+        resources_needed = np.atleast_2d(data['req'])
 
         components = []
-        for component_id, resources_needed in enumerate(processor_resources_needed):
-            component = Component(resources_needed, component_id)
+        for component_id in range(resources_needed.shape[1]):
+            component = Component(resources_needed[:, component_id], component_id)
             components.append(component)
 
         return components
@@ -70,11 +74,13 @@ class GridFactory(object):
 
         assert server_num == len(servers), 'Mismatch in server numbers.'
 
+        node_servers = [[] for _ in range(node_num)]
+        for server in servers:
+            node_servers[server.node_id].append(server)
+
         nodes = []
         for node_id, power_usage in zip(range(node_num), power_usages):
-
-            current_node_servers = [server for server in servers if server.node_id == node_id]
-            node = Node(node_id, current_node_servers, power_usage)
+            node = Node(node_id, node_servers[node_id], power_usage)
             nodes.append(node)
 
         assert node_num == len(nodes), 'Mismatch in node numbers.'
@@ -83,7 +89,7 @@ class GridFactory(object):
     def __create_layout(self, data, nodes):
         num_nodes = data['numNodes']
 
-        layout = [[None] * num_nodes] * num_nodes
+        layout = [[None] * num_nodes for _ in range(num_nodes)]
         edges = []
         for edge in data['Edges']:
             first_node_id, second_node_id, capacity, power_usage, delay = edge
@@ -104,10 +110,6 @@ class GridFactory(object):
         link_demands = []
         for demand in data['VmDemands']:
             start_component_id, end_component_id, throughput = demand
-
-            if start_component_id in [43, 44] or end_component_id in [43, 44]:
-                continue
-
             start_component = components[int(start_component_id) - 1]
             end_component = components[int(end_component_id) - 1]
 
@@ -140,26 +142,254 @@ class Grid(object):
         self.service_chains = service_chains
         self.edges = edges
         self.link_demands = link_demands
+        self.service_chain_positions = {service_chain: index for index, service_chain in enumerate(service_chains)}
+        self.link_demand_positions = {link_demand: index for index, link_demand in enumerate(link_demands)}
+
+        self.server_nodes = [nodes[server.node_id] for server in servers]
+        self.node_servers = [node.servers for node in nodes]
+        self.component_nodes = [None] * len(components)
+        for component in components:
+            if component.is_deployed_on_server():
+                self.component_nodes[component.component_id] = self.server_nodes[component.server_id]
+
+        self.component_chains = {component: [] for component in components}
+        for service_chain in service_chains:
+            for component in service_chain.components:
+                self.component_chains[component].append(service_chain)
+
+        self.component_demands = {component: [] for component in components}
+        for link_demand in link_demands:
+            link = link_demand.link
+            self.component_demands[link.start_component].append(link_demand)
+            self.component_demands[link.end_component].append(link_demand)
+
+            end_chains = set(self.component_chains[link.end_component])
+            for service_chain in self.component_chains[link.start_component]:
+                if service_chain in end_chains:
+                    service_chain.add_link(link)
+        self.service_chain_demands = dict()
+        self.revision = 0
+
+        self.route_cache = RouteCache(self, weight='delay')
+        self.residual_graph = ResidualGraph(self)
+        self.ledger = UsageLedger(self)
+        self.change_log = ChangeLog(self)
+        self.listeners = [self.ledger, self.change_log]
+        self.placement_engines = dict()
+
+        for server in self.servers:
+            server.observer = self
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def on_component_added(self, server, component):
+        self.component_nodes[component.component_id] = self.server_nodes[server.server_id]
+
+        for listener in self.listeners:
+            listener.on_component_added(server, component)
+
+    def on_component_removed(self, server, component):
+        self.component_nodes[component.component_id] = None
+
+        for listener in self.listeners:
+            listener.on_component_removed(server, component)
+
+    def reset(self):
+        for server in self.servers:
+            server.reset()
+        for component in self.components:
+            component.reset()
+        for edge in self.edges:
+            edge.reset()
+        for link_demand in self.link_demands:
+            link_demand.link.reset()
+        for service_chain in self.service_chains:
+            service_chain.reset()
+        self.component_nodes = [None] * len(self.components)
+
+        for listener in self.listeners:
+            listener.rebuild()
+
+    def checkpoint(self):
+        return self.change_log.checkpoint()
+
+    def commit(self):
+        self.change_log.commit()
+
+    def rollback(self):
+        self.change_log.rollback()
+
+    def add_service_chain(self, service_chain, link_demands):
+        assert len(self.change_log.checkpoints) == 0, 'Service chains can not change inside a checkpoint.'
+        assert len(service_chain.links) == 0, 'Service chain links are derived from its link demands.'
+
+        components = [component for component in service_chain.components if not self.has_component(component)]
+        for component in components:
+            assert not component.is_deployed_on_server(), 'New components should not be deployed.'
+
+            component.component_id = len(self.components)
+            self.components.append(component)
+            self.component_nodes.append(None)
+            self.component_chains[component] = []
+            self.component_demands[component] = []
+
+        for component in service_chain.components:
+            self.component_chains[component].append(service_chain)
+        self.__append(self.service_chains, self.service_chain_positions, service_chain)
+        self.service_chain_demands[service_chain] = list(link_demands)
+
+        for link_demand in link_demands:
+            link = link_demand.link
+            assert self.has_component(link.start_component) and self.has_component(link.end_component), \
+                'Link demands should connect components of the grid.'
+
+            self.__append(self.link_demands, self.link_demand_positions, link_demand)
+            self.component_demands[link.start_component].append(link_demand)
+            self.component_demands[link.end_component].append(link_demand)
+
+            for other_chain in self.component_chains[link.start_component]:
+                if other_chain is not service_chain and other_chain in self.component_chains[link.end_component]:
+                    other_chain.add_link(link)
+
+        chain_components = set(service_chain.components)
+        for component in service_chain.components:
+            for link_demand in self.component_demands[component]:
+                link = link_demand.link
+                if link.start_component is component and link.end_component in chain_components:
+                    service_chain.add_link(link)
+                    service_chain.add_delay(link.delay)
+
+        self.revision += 1
+        for listener in self.listeners:
+            listener.on_service_chain_added(service_chain, components, link_demands)
+
+        return components
+
+    def remove_service_chain(self, service_chain):
+        assert len(self.change_log.checkpoints) == 0, 'Service chains can not change inside a checkpoint.'
+
+        components = [
+            component for component in service_chain.components if self.component_chains[component] == [service_chain]
+        ]
+        link_demands, seen = [], set()
+        chain_demands = [
+            link_demand for link_demand in self.service_chain_demands.pop(service_chain, [])
+            if link_demand in self.link_demand_positions
+        ]
+        component_demands = [
+            link_demand for component in components for link_demand in self.component_demands[component]
+        ]
+        for link_demand in chain_demands + component_demands:
+            if link_demand not in seen:
+                seen.add(link_demand)
+                link_demands.append(link_demand)
+
+        for link_demand in link_demands:
+            if len(link_demand.link.nodes) > 0:
+                self.remove_link_route(link_demand.link, link_demand.throughput)
+        for component in components:
+            if component.is_deployed_on_server():
+                self.servers[component.server_id].remove_component(component)
+
+        for link in service_chain.links:
+            link.service_chains.remove(service_chain)
+        for link_demand in link_demands:
+            link = link_demand.link
+            for other_chain in link.service_chains:
+                other_chain.links.remove(link)
+            link.service_chains = []
+        for component in service_chain.components:
+            self.component_chains[component].remove(service_chain)
+        self.__swap_remove(self.service_chains, self.service_chain_positions, service_chain)
+
+        for link_demand in link_demands:
+            self.__swap_remove(self.link_demands, self.link_demand_positions, link_demand)
+            for component in (link_demand.link.start_component, link_demand.link.end_component):
+                if link_demand in self.component_demands.get(component, []):
+                    self.component_demands[component].remove(link_demand)
+
+        for component in components:
+            self.__remove_component(component)
+
+        self.revision += 1
+        for listener in self.listeners:
+            listener.on_service_chain_removed(service_chain, components, link_demands)
+
+        return components, link_demands
+
+    def __remove_component(self, component):
+        component_id = component.component_id
+        last_component = self.components.pop()
+        last_node = self.component_nodes.pop()
+
+        if last_component is not component:
+            last_component.component_id = component_id
+            self.components[component_id] = last_component
+            self.component_nodes[component_id] = last_node
+
+        del self.component_chains[component]
+        del self.component_demands[component]
+        component.component_id = None
+
+    @staticmethod
+    def __append(items, positions, item):
+        positions[item] = len(items)
+        items.append(item)
+
+    @staticmethod
+    def __swap_remove(items, positions, item):
+        position = positions.pop(item)
+        last_item = items.pop()
+        if position < len(items):
+            items[position] = last_item
+            positions[last_item] = position
+
+    def service_chain_index(self, service_chain):
+        return self.service_chain_positions[service_chain]
+
+    def link_demand_index(self, link_demand):
+        return self.link_demand_positions[link_demand]
+
+    def has_component(self, component):
+        component_id = component.component_id
+        return component_id is not None and component_id < len(self.components) and \
+            self.components[component_id] is component
+
+    def dump_solution(self):
+        placement = [component.server_id for component in self.components]
+        routes = [[node.node_id for node in link_demand.link.nodes] for link_demand in self.link_demands]
+        return placement, routes
+
+    def load_solution(self, placement, routes):
+        self.reset()
+
+        for component, server_id in zip(self.components, placement):
+            if server_id is not None:
+                self.servers[server_id].add_component(component)
+
+        unrouted_demands = []
+        for link_demand, route in zip(self.link_demands, routes):
+            if len(route) > 0:
+                nodes = [self.nodes[node_id] for node_id in route]
+                if not self.try_add_link_route(link_demand.link, nodes, link_demand.throughput):
+                    unrouted_demands.append(link_demand)
+
+        return unrouted_demands
 
     def is_active_edge(self, edge):
-        assert isinstance(edge, Edge), 'Edge should be an instance of edge.'
-        return any([link_demand.link.has_edge(edge) for link_demand in self.link_demands])
+        return self.ledger.is_active_edge(edge)
 
     def is_active_node(self, node):
-        assert isinstance(node, Node), 'Node should be an instance of node.'
-
-        active_edges = any([link_demand.link.has_node(node) for link_demand in self.link_demands])
-        active_servers = any([server.is_active() for server in node.servers])
-        return active_edges or active_servers
+        return self.ledger.is_active_node(node)
 
     def throughput_on_edge(self, edge):
         assert isinstance(edge, Edge), 'Edge should be an instance of Edge.'
 
-        throughput = sum(
-            [link_demand.throughput for link_demand in self.link_demands if link_demand.link.has_edge(edge)]
-        )
-
-        return throughput
+        return edge.capacity_used
 
     def components_are_deployed_on_the_same_server(self, component1, component2):
         return component1.server_id == component2.server_id
@@ -168,55 +398,102 @@ class Grid(object):
         return self.components_are_deployed_on_the_same_server(link.start_component, link.end_component)
 
     def get_servers_node(self, server):
-        for node in self.nodes:
-            if node.node_id == server.node_id:
-                return node
+        return self.server_nodes[server.server_id]
 
     def get_component_node(self, component):
-        server = self.servers[component.server_id]
-        return self.get_servers_node(server)
+        return self.component_nodes[component.component_id]
 
     def are_components_on_same_node(self, component1, component2):
-        return self.get_component_node(component1) == self.get_component_node(component2)
+        node = self.component_nodes[component1.component_id]
+        return node is not None and node is self.component_nodes[component2.component_id]
 
     def get_routes(self, start_component, end_component):
         start_node = self.get_component_node(start_component)
         end_node = self.get_component_node(end_component)
 
         if start_node.node_id != end_node.node_id:
-            routes = list(self.depth_first_search(start_node, end_node))
-            return routes
+            return list(self.route_cache.get_routes(start_node, end_node))
         else:
             return []
 
-    def depth_first_search(self, start_node, end_node):
-        stack = [(start_node, [start_node])]
-        while stack:
-            (vertex, path) = stack.pop()
-            for next in set(vertex.adjacent_nodes) - set(path):
-                if next.node_id == end_node.node_id:
-                    yield path + [next]
-                else:
-                    stack.append((next, path + [next]))
+    def get_feasible_routes(self, start_node, end_node, throughput, max_delay=None):
+        routes = self.route_cache.get_routes(start_node, end_node)
+        route_edges = self.route_cache.get_route_edges(start_node, end_node)
+        route_delays = self.route_cache.get_route_delays(start_node, end_node)
+
+        feasible_routes = [
+            route for route, edges, delay in zip(routes, route_edges, route_delays)
+            if min([edge.get_available_capacity() for edge in edges]) > throughput and
+            (max_delay is None or delay < max_delay)
+        ]
+
+        if instrumentation.enabled:
+            instrumentation.count('routes_enumerated', len(routes))
+            instrumentation.count('routes_rejected', len(routes) - len(feasible_routes))
+
+        return feasible_routes
+
+    def get_best_feasible_route(self, start_component, end_component, throughput, key=None, max_delay=None):
+        start_node = self.get_component_node(start_component)
+        end_node = self.get_component_node(end_component)
+        if start_node.node_id == end_node.node_id:
+            return None
+
+        feasible_routes = self.get_feasible_routes(start_node, end_node, throughput, max_delay)
+        if len(feasible_routes) == 0:
+            path = self.residual_graph.shortest_path(start_node, end_node, throughput, max_delay)
+            if instrumentation.enabled and path is not None:
+                instrumentation.count('routes_searched')
+            return path[0] if path is not None else None
+
+        if key is not None:
+            return min(feasible_routes, key=key)
+
+        return feasible_routes[0]
+
+    def try_add_link_route(self, link, nodes, throughput):
+        edges = self.transform_node_route_to_edge_route(nodes)
+        if not ResidualGraph.reserve(edges, throughput):
+            return False
+
+        self.__add_reserved_route(link, nodes, edges, throughput)
+        return True
 
     def add_link_route(self, link, nodes, throughput):
         edges = self.transform_node_route_to_edge_route(nodes)
         self.add_capacity_to_route(edges, throughput)
+        self.__add_reserved_route(link, nodes, edges, throughput)
+
+    def __add_reserved_route(self, link, nodes, edges, throughput):
         link.add_route(nodes)
         link.edges = edges
+        link.delay = sum([edge.delay for edge in edges])
+
+        for service_chain in link.service_chains:
+            service_chain.add_delay(link.delay)
+
+        for listener in self.listeners:
+            listener.on_route_added(link, nodes, edges, throughput)
+
+    def remove_link_route(self, link, throughput):
+        nodes, edges = link.nodes, link.edges
+
+        ResidualGraph.release(edges, throughput)
+        for service_chain in link.service_chains:
+            service_chain.add_delay(-link.delay)
+        link.reset()
+
+        for listener in self.listeners:
+            listener.on_route_removed(link, nodes, edges, throughput)
 
     def transform_node_route_to_edge_route(self, nodes):
         return [self.get_edge(start_node=nodes[i-1], end_node=nodes[i]) for i in range(1, len(nodes))]
 
     def add_capacity_to_route(self, edges, throughput):
-        for edge in edges:
-            edge.add_capacity(throughput)
+        if not ResidualGraph.reserve(edges, throughput):
+            raise OutOfCapacityException
 
     def get_edge(self, start_node, end_node):
         return self.layout[start_node.node_id][end_node.node_id]
 
-    def min_available_route_capacity(self, nodes):
-        edges = self.transform_node_route_to_edge_route(nodes)
-        return min([edge.get_available_capacity() for edge in edges])
-
 
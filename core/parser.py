@@ -1,5 +1,8 @@
-from numpy import loadtxt
-from io import StringIO
+from core.binary import BinaryInstance
+from core.tokenizer import Tokenizer, Token, ArrayBuilder
+from utils.exceptions import ParseException
+from utils.instrumentation import timed
+import sys
 
 
 class Parser(object):
@@ -8,46 +11,187 @@ class Parser(object):
     matrix_variables = ('req', 'av', 'al', 'sc')
     list_vector_variables = ('Edges', 'VmDemands')
 
+    shape_hints = {
+        'lat': ('numServiceChains',),
+        'P_max': ('numServers',),
+        'P_min': ('numServers',),
+        'P': ('numNodes',),
+        'req': ('numRes', 'numVms'),
+        'av': ('numRes', 'numServers'),
+        'al': ('numServers', 'numNodes'),
+        'sc': ('numServiceChains', 'numVms')
+    }
+
     def __init__(self, file_path):
         assert isinstance(file_path, str), 'File path must be string'
 
         self.file_path = file_path
         self.data = dict()
+        self.tokens = None
+        self.token = None
 
-        self.parser_factory = {
-            self.integer_variables: self.__parse_integers,
-            self.list_variables: self.__parse_lists,
-            self.matrix_variables: self.__parse_matrices,
-            self.list_vector_variables: self.__parse_list_vectors
-        }
-
-    def read(self):
-        lines = open(self.file_path).read().replace('\n', '').split(';')
-        return filter(None, lines)
-
+    @timed('parse')
     def parse(self):
-        lines = self.read()
-
-        for i, line in enumerate(lines):
-            var_name, var_content = line.split(' = ')
-
-            for variables, extractor in self.parser_factory.items():
-                if var_name in variables:
-                    self.data[var_name] = extractor(var_content)
-
-    def __parse_integers(self, var_content):
-        return int(var_content)
-
-    def __parse_lists(self, var_content):
-        return loadtxt(StringIO(var_content[1:-1]), delimiter=',')
-
-    def __parse_matrices(self, var_content):
-        content = var_content[1:-1].replace('][', '\n')[1:-1]
-        return loadtxt(StringIO(content), delimiter=',')
-
-    def __parse_list_vectors(self, var_content):
-        content = var_content[1:-1].replace('>,', '\n').replace('<', '')
-        return loadtxt(StringIO(content), delimiter=',')
+        if BinaryInstance.is_binary(self.file_path):
+            self.data = BinaryInstance.read(self.file_path)
+            return
+
+        with open(self.file_path) as instance_file:
+            self.tokens = Tokenizer(instance_file)
+            self.__next()
+
+            while self.token.kind != Token.END:
+                self.__parse_statement()
+
+    def __next(self):
+        self.token = next(self.tokens)
+
+    def __error(self, message):
+        raise ParseException(message, self.token.line, self.token.column)
+
+    def __expect(self, value):
+        if self.token.value != value:
+            self.__error('Expected {0!r}, found {1!r}'.format(value, self.token.value))
+        self.__next()
+
+    def __parse_statement(self):
+        if self.token.kind != Token.NAME:
+            self.__error('Expected a variable name, found {0!r}'.format(self.token.value))
+
+        var_name = self.token.value
+        self.__next()
+        self.__expect('=')
+
+        if self.token.kind == Token.NUMBER:
+            self.data[var_name] = self.__parse_number(var_name)
+        elif self.token.value == '[':
+            self.data[var_name] = self.__parse_array(var_name)
+        elif self.token.value == '{':
+            self.data[var_name] = self.__parse_list_vectors()
+        else:
+            self.__error('Unexpected value {0!r} for {1}'.format(self.token.value, var_name))
+
+        self.__expect(';')
+
+    def __parse_number(self, var_name):
+        value = self.token.value
+        self.__next()
+
+        if var_name in self.integer_variables:
+            if value != int(value):
+                self.__error('{0} should be an integer'.format(var_name))
+            return int(value)
+
+        return value
+
+    def __parse_array(self, var_name):
+        values = ArrayBuilder(self.__capacity_hint(var_name))
+        self.__expect('[')
+
+        if self.token.value != '[':
+            self.__parse_numbers(values, ']')
+            self.__expect(']')
+            return values.build()
+
+        row_length = None
+        rows = 0
+        while self.token.value == '[':
+            numbers, row_lengths = self.tokens.read_groups('[', ']', ']')
+            if len(row_lengths) > 0:
+                row_length = self.__check_group_lengths(row_lengths, row_length, 'row of {0}'.format(var_name))
+                values.extend(numbers)
+                rows += len(row_lengths)
+
+                self.__next()
+                if self.token.value == ',':
+                    self.__next()
+                continue
+
+            self.__next()
+            row_length_before = values.size
+            self.__parse_numbers(values, ']')
+
+            if row_length is None:
+                row_length = values.size - row_length_before
+            elif values.size - row_length_before != row_length:
+                self.__error('Every row of {0} should have {1} values'.format(var_name, row_length))
+
+            self.__expect(']')
+            rows += 1
+
+            if self.token.value == ',':
+                self.__next()
+
+        self.__expect(']')
+        return values.build((rows, row_length))
+
+    def __parse_list_vectors(self):
+        values = ArrayBuilder()
+        self.__expect('{')
+
+        vector_length = None
+        vectors = 0
+        while self.token.value == '<':
+            numbers, vector_lengths = self.tokens.read_groups('<', '>', '}')
+            if len(vector_lengths) > 0:
+                vector_length = self.__check_group_lengths(vector_lengths, vector_length, 'tuple')
+                values.extend(numbers)
+                vectors += len(vector_lengths)
+
+                self.__next()
+                if self.token.value == ',':
+                    self.__next()
+                continue
+
+            self.__next()
+            vector_length_before = values.size
+            self.__parse_numbers(values, '>')
+
+            if vector_length is None:
+                vector_length = values.size - vector_length_before
+            elif values.size - vector_length_before != vector_length:
+                self.__error('Every tuple should have {0} values'.format(vector_length))
+
+            self.__expect('>')
+            vectors += 1
+
+            if self.token.value == ',':
+                self.__next()
+
+        self.__expect('}')
+        return values.build((vectors, vector_length if vector_length is not None else 0))
+
+    def __parse_numbers(self, values, closing_symbol):
+        while self.token.value != closing_symbol:
+            if self.token.kind != Token.NUMBER:
+                self.__error('Expected a number, found {0!r}'.format(self.token.value))
+
+            values.append(self.token.value)
+            values.extend(self.tokens.read_numbers(closing_symbol))
+            self.__next()
+
+            if self.token.value == ',':
+                self.__next()
+            elif self.token.value != closing_symbol:
+                self.__error('Expected \',\' or {0!r}, found {1!r}'.format(closing_symbol, self.token.value))
+
+    def __check_group_lengths(self, group_lengths, expected_length, group_name):
+        if expected_length is None:
+            expected_length = group_lengths[0]
+
+        if (group_lengths != expected_length).any():
+            self.__error('Every {0} should have {1} values'.format(group_name, expected_length))
+
+        return int(expected_length)
+
+    def __capacity_hint(self, var_name):
+        capacity = 1
+        for dimension in self.shape_hints.get(var_name, ()):
+            if dimension not in self.data:
+                return 64
+            capacity *= self.data[dimension]
+
+        return capacity
 
     def __getitem__(self, item):
         return self.data.get(item)
@@ -58,8 +202,18 @@ class Parser(object):
     def get_parsed_data(self):
         return self.data
 
+    def compile(self, binary_path):
+        if len(self.data) == 0:
+            self.parse()
+
+        BinaryInstance.write(self.data, binary_path)
+
 
 def main():
+    if len(sys.argv) == 3:
+        Parser(sys.argv[1]).compile(sys.argv[2])
+        return
+
     parser = Parser('../data/instance.txt')
     parser.parse()
     print(parser)
@@ -1,44 +1,50 @@
 from core.grid import GridFactory
 from core.parser import Parser
+from utils.instrumentation import timed
 import numpy as np
+import logging
+import gzip
+import re
+import io
+
+logger = logging.getLogger(__name__)
 
 
 class Problem(object):
 
     def __init__(self, file_path):
         self.file_path = file_path
+        self.data = None
         self.grid = None
         self.constraint_service = None
 
     def init(self):
+        if self.grid is None:
+            self.reload()
+        else:
+            self.grid.reset()
+
+    def reload(self):
         parser = Parser(self.file_path)
         parser.parse()
+        self.build(parser.get_parsed_data())
 
-        grid_factory = GridFactory(parser.get_parsed_data())
+    def build(self, data):
+        self.data = data
+
+        grid_factory = GridFactory(self.data)
         grid_factory.create_grid()
         self.grid = grid_factory.get_grid()
 
-        self.constraint_service = ConstraintService(self.grid)
+        self.constraint_service = IncrementalConstraintService(self.grid)
 
+    @timed('fitness')
     def fitness(self):
-        edges_power_costs = [edge.power_usage for edge in self.grid.edges if self.grid.is_active_edge(edge)]
-        nodes_power_costs = [node.power_usage for node in self.grid.nodes if self.grid.is_active_node(node)]
-        servers_power_costs = [self.__get_server_power_usage(server) for server in self.grid.servers]
-
-        print(sum(edges_power_costs), sum(nodes_power_costs), sum(servers_power_costs))
-        return sum(edges_power_costs) + sum(nodes_power_costs) + sum(servers_power_costs)
-
-    def __get_server_power_usage(self, server):
-        node = self.grid.get_servers_node(server)
+        ledger = self.grid.ledger
 
-        if server.is_active() and self.grid.is_active_node(node):
-            server_components_power_usage = sum([component.resources_needed for component in server.components])
-            average_server_power = (server.max_power - server.min_power) / server.max_resources
-            server_power = server.min_power + average_server_power * server_components_power_usage
-
-            return server_power
-        else:
-            return 0
+        logger.debug('Power usage: edges %s, nodes %s, servers %s', ledger.edges_power, ledger.nodes_power,
+                     ledger.servers_power)
+        return ledger.total_power()
 
     def active_servers(self):
         return [server for server in self.grid.servers if server.is_active()]
@@ -65,6 +71,7 @@ class ConstraintService(object):
             constraint_function, constraint_description = constraint
             print('[{0}] {1}'.format(constraint_function(), constraint_description))
 
+    @timed('constraints')
     def check_all(self):
         for constraint in self.constraints:
             constraint_function, constraint_description = constraint
@@ -110,56 +117,257 @@ class ConstraintService(object):
         return not constraint_failed
 
 
+class IncrementalConstraintService(ConstraintService):
+
+    def __init__(self, grid):
+        super(IncrementalConstraintService, self).__init__(grid)
+
+        self.link_demands = {link_demand.link: link_demand for link_demand in grid.link_demands}
+
+        self.rebuild()
+        grid.subscribe(self)
+
+    def rebuild(self):
+        self.undeployed_components = set(
+            component for component in self.grid.components if not component.is_deployed_on_server()
+        )
+        self.overloaded_servers = set(
+            server for server in self.grid.servers if server.is_using_more_resources_then_available()
+        )
+        self.overloaded_edges = set(edge for edge in self.grid.edges if edge.capacity_used > edge.capacity)
+        self.delayed_chains = set(
+            service_chain for service_chain in self.grid.service_chains
+            if not service_chain.link_delays_are_within_max_delay()
+        )
+        self.unmet_demands = set(
+            link_demand for link_demand in self.grid.link_demands if not self.__is_demand_met(link_demand)
+        )
+
+    def is_feasible(self):
+        return self.violation_count() == 0
+
+    def violation_count(self):
+        return len(self.undeployed_components) + len(self.overloaded_servers) + len(self.overloaded_edges) + \
+            len(self.delayed_chains) + len(self.unmet_demands)
+
+    def violations(self):
+        return {
+            'components': sorted(component.component_id for component in self.undeployed_components),
+            'servers': sorted(server.server_id for server in self.overloaded_servers),
+            'edges': sorted((edge.start_node.node_id, edge.end_node.node_id) for edge in self.overloaded_edges),
+            'service_chains': sorted(self.grid.service_chain_index(chain) for chain in self.delayed_chains),
+            'link_demands': sorted(self.grid.link_demand_index(demand) for demand in self.unmet_demands)
+        }
+
+    @timed('constraints')
+    def check_all(self):
+        return self.is_feasible()
+
+    def components_are_deployed(self):
+        return len(self.undeployed_components) == 0
+
+    def servers_did_not_use_more_resources_then_they_have(self):
+        return len(self.overloaded_servers) == 0
+
+    def edge_traffic_is_lower_then_edge_capacity(self):
+        return len(self.overloaded_edges) == 0
+
+    def service_chains_are_within_max_delay_range(self):
+        return len(self.delayed_chains) == 0
+
+    def every_link_demand_is_met(self):
+        return len(self.unmet_demands) == 0
+
+    def on_component_added(self, server, component):
+        self.undeployed_components.discard(component)
+        self.__update_server(server)
+        self.__update_demands(self.grid.component_demands[component])
+
+    def on_component_removed(self, server, component):
+        self.undeployed_components.add(component)
+        self.__update_server(server)
+        self.__update_demands(self.grid.component_demands[component])
+
+    def on_route_added(self, link, nodes, edges, throughput):
+        self.__update_route(link, edges)
+
+    def on_route_removed(self, link, nodes, edges, throughput):
+        self.__update_route(link, edges)
+
+    def on_service_chain_added(self, service_chain, components, link_demands):
+        for component in components:
+            self.__update(self.undeployed_components, component, not component.is_deployed_on_server())
+        for link_demand in link_demands:
+            self.link_demands[link_demand.link] = link_demand
+        self.__update_demands(link_demands)
+        self.__update(self.delayed_chains, service_chain, not service_chain.link_delays_are_within_max_delay())
+
+    def on_service_chain_removed(self, service_chain, components, link_demands):
+        for component in components:
+            self.undeployed_components.discard(component)
+        for link_demand in link_demands:
+            del self.link_demands[link_demand.link]
+            self.unmet_demands.discard(link_demand)
+        self.delayed_chains.discard(service_chain)
+
+    def __update_route(self, link, edges):
+        for edge in edges:
+            self.__update(self.overloaded_edges, edge, edge.capacity_used > edge.capacity)
+        for service_chain in link.service_chains:
+            self.__update(self.delayed_chains, service_chain, not service_chain.link_delays_are_within_max_delay())
+        self.__update_demands([self.link_demands[link]])
+
+    def __update_server(self, server):
+        self.__update(self.overloaded_servers, server, server.is_using_more_resources_then_available())
+
+    def __update_demands(self, link_demands):
+        for link_demand in link_demands:
+            self.__update(self.unmet_demands, link_demand, not self.__is_demand_met(link_demand))
+
+    def __is_demand_met(self, link_demand):
+        return link_demand.get_route_length() > 0 or self.grid.are_components_on_same_node(
+            link_demand.link.start_component, link_demand.link.end_component
+        )
+
+    def __update(self, violations, item, is_violated):
+        if is_violated:
+            violations.add(item)
+        else:
+            violations.discard(item)
+
+
 class WriterService(object):
 
-    def __init__(self, program):
+    def __init__(self, program, sparse=False, compress=False, chunk_size=4096):
+        assert chunk_size > 0, 'Chunk size should be positive.'
+
         self.program = program
+        self.sparse = sparse
+        self.compress = compress
+        self.chunk_size = chunk_size
 
     def write(self, file_path=None):
         if file_path is None:
-            print(self.__generate_output_string())
+            output = io.StringIO()
+            self.write_to(output)
+            print(output.getvalue())
+        elif self.compress or file_path.endswith('.gz'):
+            with gzip.open(file_path, 'wt') as output_file:
+                self.write_to(output_file)
         else:
             with open(file_path, 'w') as output_file:
-                output_file.write(self.__generate_output_string())
+                self.write_to(output_file)
 
-    def __generate_output_string(self):
-        output_string = 'x={0};\n\nroutes={1};'.format(
-            self.__generate_component_server_matrix(),
-            self.__generate_routes()
+    def write_to(self, output_file):
+        placement = np.array(
+            [-1 if component.server_id is None else component.server_id for component in self.program.grid.components],
+            dtype=np.int64
         )
-        return output_string
 
-    def __generate_component_server_matrix(self):
-        component_server_matrix = []
-        server_num = len(self.program.grid.servers)
-        for component in self.program.grid.components:
-            component_sever_one_hot = [0] * server_num
-            component_sever_one_hot[component.server_id] = 1
+        output_file.write('x=')
+        if self.sparse:
+            self.__write_component_server_pairs(output_file, placement)
+        else:
+            self.__write_component_server_matrix(output_file, placement)
+        output_file.write(';\n\nroutes=')
+        self.__write_routes(output_file)
+        output_file.write(';')
+
+    def __write_component_server_matrix(self, output_file, placement):
+        row = np.frombuffer(
+            '[{0}]\n'.format(','.join(['0'] * len(self.program.grid.servers))).encode('ascii'), dtype=np.uint8
+        )
 
-            row_format = '[{0}]'.format((','.join(map(lambda x: str(x), component_sever_one_hot))))
-            component_server_matrix.append(row_format)
+        output_file.write('[\n' if len(placement) > 0 else '[\n\n')
+        for start in range(0, len(placement), self.chunk_size):
+            chunk = placement[start:start + self.chunk_size]
+            rows = np.tile(row, (len(chunk), 1))
+
+            deployed = np.flatnonzero(chunk > -1)
+            rows[deployed, 1 + 2 * chunk[deployed]] = ord('1')
+            output_file.write(rows.tobytes().decode('ascii'))
+        output_file.write(']')
+
+    def __write_component_server_pairs(self, output_file, placement):
+        component_ids = np.flatnonzero(placement > -1)
+
+        output_file.write('{\n')
+        for start in range(0, len(component_ids), self.chunk_size):
+            chunk = component_ids[start:start + self.chunk_size]
+            output_file.write(''.join(
+                '<{0},{1}>,\n'.format(component_id, server_id)
+                for component_id, server_id in zip((chunk + 1).tolist(), (placement[chunk] + 1).tolist())
+            ))
+        output_file.write('}')
+
+    def __write_routes(self, output_file):
+        grid = self.program.grid
+        link_demands = grid.link_demands
+
+        output_file.write('{\n' if len(link_demands) > 0 else '{\n,\n')
+        for start in range(0, len(link_demands), self.chunk_size):
+            routes = []
+            for link_demand in link_demands[start:start + self.chunk_size]:
+                link = link_demand.link
+                nodes = link.nodes if len(link.nodes) > 0 else [grid.get_component_node(link.end_component)]
+
+                routes.append('<{0},{1},[{2}]>,\n'.format(
+                    link.start_component.component_id + 1,
+                    link.end_component.component_id + 1,
+                    ','.join([str(node.node_id + 1) for node in nodes])
+                ))
+            output_file.write(''.join(routes))
+        output_file.write('}')
+
+
+class ReaderService(object):
+    placement_pattern = re.compile(r'x\s*=\s*\[(.*?)\]\s*;', re.DOTALL)
+    sparse_placement_pattern = re.compile(r'x\s*=\s*\{(.*?)\}\s*;', re.DOTALL)
+    routes_pattern = re.compile(r'routes\s*=\s*\{(.*?)\}\s*;', re.DOTALL)
+    route_pattern = re.compile(r'<\s*(\d+)\s*,\s*(\d+)\s*,\s*\[([\d,\s]*)\]\s*>')
 
-        return '[\n{0}\n]'.format('\n'.join(component_server_matrix))
+    def __init__(self, program):
+        self.program = program
+
+    def read(self, file_path):
+        with open(file_path, 'rb') as input_file:
+            is_compressed = input_file.read(2) == b'\x1f\x8b'
+
+        with (gzip.open(file_path, 'rt') if is_compressed else open(file_path)) as input_file:
+            return self.parse(input_file.read())
+
+    def parse(self, text):
+        grid = self.program.grid
+        placement_match = self.placement_pattern.search(text)
+        sparse_placement_match = self.sparse_placement_pattern.search(text)
+        routes_match = self.routes_pattern.search(text)
+        assert placement_match is not None or sparse_placement_match is not None, 'Solution should define x.'
+        assert routes_match is not None, 'Solution should define routes.'
+
+        if placement_match is not None:
+            one_hot = np.fromstring(re.sub(r'[\[\],]', ' ', placement_match.group(1)), sep=' ')
+            assert len(one_hot) == len(grid.components) * len(grid.servers), \
+                'x should be a components by servers matrix.'
+            one_hot = one_hot.reshape(len(grid.components), len(grid.servers))
+            placement = [int(np.argmax(row)) if row.any() else None for row in one_hot]
+        else:
+            pairs = np.fromstring(re.sub(r'[<>,]', ' ', sparse_placement_match.group(1)), sep=' ').astype(np.int64)
+            placement = [None] * len(grid.components)
+            for component_id, server_id in pairs.reshape(-1, 2) - 1:
+                placement[component_id] = int(server_id)
+
+        written_routes = dict()
+        for match in self.route_pattern.finditer(routes_match.group(1)):
+            start_component_id, end_component_id, nodes = match.groups()
+            node_ids = [int(node_id) - 1 for node_id in nodes.replace(',', ' ').split()]
+            key = (int(start_component_id) - 1, int(end_component_id) - 1)
+            written_routes.setdefault(key, []).append(node_ids if len(node_ids) > 1 else [])
 
-    def __generate_routes(self):
         routes = []
-        for link_demand in self.program.grid.link_demands:
-            # print(self.program.grid.get_component_node(link_demand.link.start_component))
-            # print(self.program.grid.get_component_node(link_demand.link.end_component))
-            # print(link_demand)
-            # print()
-
-            node_route = link_demand.link.nodes.__str__().replace(' ', '')
-
-            if node_route == '[]':
-                node = self.program.grid.get_component_node(link_demand.link.end_component)
-                node_route = '[%d]' % (node.node_id + 1)
-
-            route_string = '<{0},{1},{2}>'.format(
-                link_demand.link.start_component.component_id + 1,
-                link_demand.link.end_component.component_id + 1,
-                node_route
-            )
-            routes.append(route_string)
+        for link_demand in grid.link_demands:
+            key = (link_demand.link.start_component.component_id, link_demand.link.end_component.component_id)
+            candidates = written_routes.get(key, [])
+            routes.append(candidates.pop(0) if len(candidates) > 0 else [])
+
+        return placement, routes
 
-        return '{\n' + ',\n'.join(routes) + ',\n}'
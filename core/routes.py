@@ -0,0 +1,200 @@
+import heapq
+
+
+class RouteCache(object):
+    weights = ('hops', 'delay')
+
+    def __init__(self, grid, k=10, weight='hops'):
+        assert k > 0, 'Route cache should keep at least one route per node pair.'
+        assert weight in self.weights, 'Weight should be one of {0}.'.format(self.weights)
+
+        self.grid = grid
+        self.k = k
+        self.weight = weight
+        self.routes = dict()
+        self.route_edges = dict()
+        self.route_delays = dict()
+        self.adjacency = self.__create_adjacency(grid)
+
+    def __create_adjacency(self, grid):
+        adjacency = dict()
+        for node in grid.nodes:
+            neighbours = sorted(set(adjacent_node.node_id for adjacent_node in node.adjacent_nodes))
+            adjacency[node.node_id] = [
+                (neighbour, self.__edge_weight(node.node_id, neighbour)) for neighbour in neighbours
+            ]
+
+        return adjacency
+
+    def __edge_weight(self, start_node_id, end_node_id):
+        if self.weight == 'hops':
+            return 1
+
+        return self.grid.layout[start_node_id][end_node_id].delay
+
+    def get_routes(self, start_node, end_node):
+        key = (start_node.node_id, end_node.node_id)
+
+        if key not in self.routes:
+            self.__add_routes(key)
+
+        return self.routes[key]
+
+    def get_route_edges(self, start_node, end_node):
+        key = (start_node.node_id, end_node.node_id)
+
+        if key not in self.routes:
+            self.__add_routes(key)
+
+        return self.route_edges[key]
+
+    def get_route_delays(self, start_node, end_node):
+        key = (start_node.node_id, end_node.node_id)
+
+        if key not in self.routes:
+            self.__add_routes(key)
+
+        return self.route_delays[key]
+
+    def __add_routes(self, key):
+        routes = [[self.grid.nodes[node_id] for node_id in route] for route in self.k_shortest_paths(*key)]
+        route_edges = [self.grid.transform_node_route_to_edge_route(route) for route in routes]
+
+        self.routes[key] = routes
+        self.route_edges[key] = route_edges
+        self.route_delays[key] = [sum([edge.delay for edge in edges]) for edges in route_edges]
+
+    def route_cost(self, node_ids):
+        return sum(self.__edge_weight(node_ids[i - 1], node_ids[i]) for i in range(1, len(node_ids)))
+
+    def k_shortest_paths(self, start_node_id, end_node_id):
+        shortest_path = self.shortest_path(start_node_id, end_node_id)
+        if shortest_path is None:
+            return []
+
+        paths = [shortest_path]
+        candidates = []
+        seen = {tuple(shortest_path)}
+
+        while len(paths) < self.k:
+            last_path = paths[-1]
+
+            for i in range(len(last_path) - 1):
+                spur_node_id = last_path[i]
+                root_path = last_path[:i + 1]
+
+                removed_edges = set()
+                for path in paths:
+                    if path[:i + 1] == root_path:
+                        removed_edges.add((path[i], path[i + 1]))
+
+                removed_nodes = set(root_path[:-1])
+                spur_path = self.shortest_path(spur_node_id, end_node_id, removed_nodes, removed_edges)
+
+                if spur_path is not None:
+                    total_path = root_path[:-1] + spur_path
+                    if tuple(total_path) not in seen:
+                        seen.add(tuple(total_path))
+                        heapq.heappush(candidates, (self.route_cost(total_path), len(total_path), total_path))
+
+            if not candidates:
+                break
+
+            paths.append(heapq.heappop(candidates)[2])
+
+        return paths
+
+    def shortest_path(self, start_node_id, end_node_id, removed_nodes=(), removed_edges=()):
+        distances = {start_node_id: 0}
+        previous = dict()
+        queue = [(0, start_node_id)]
+
+        while queue:
+            distance, node_id = heapq.heappop(queue)
+
+            if node_id == end_node_id:
+                path = [node_id]
+                while path[-1] != start_node_id:
+                    path.append(previous[path[-1]])
+                return path[::-1]
+
+            if distance > distances[node_id]:
+                continue
+
+            for neighbour_id, weight in self.adjacency[node_id]:
+                if neighbour_id in removed_nodes or (node_id, neighbour_id) in removed_edges:
+                    continue
+
+                new_distance = distance + weight
+                if new_distance < distances.get(neighbour_id, float('inf')):
+                    distances[neighbour_id] = new_distance
+                    previous[neighbour_id] = node_id
+                    heapq.heappush(queue, (new_distance, neighbour_id))
+
+        return None
+
+
+class ResidualGraph(object):
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.adjacency = dict()
+
+        for node in grid.nodes:
+            neighbours = sorted(set(adjacent_node.node_id for adjacent_node in node.adjacent_nodes))
+            self.adjacency[node.node_id] = [
+                (neighbour_id, grid.layout[node.node_id][neighbour_id]) for neighbour_id in neighbours
+            ]
+
+    def shortest_path(self, start_node, end_node, min_capacity=0, max_delay=None):
+        delays = {start_node.node_id: 0}
+        previous = dict()
+        queue = [(0, start_node.node_id)]
+
+        while queue:
+            delay, node_id = heapq.heappop(queue)
+
+            if node_id == end_node.node_id:
+                return self.__path(start_node.node_id, end_node.node_id, previous)
+            if delay > delays[node_id]:
+                continue
+
+            for neighbour_id, edge in self.adjacency[node_id]:
+                if edge.get_available_capacity() <= min_capacity:
+                    continue
+
+                new_delay = delay + edge.delay
+                if max_delay is not None and new_delay >= max_delay:
+                    continue
+
+                if new_delay < delays.get(neighbour_id, float('inf')):
+                    delays[neighbour_id] = new_delay
+                    previous[neighbour_id] = (node_id, edge)
+                    heapq.heappush(queue, (new_delay, neighbour_id))
+
+        return None
+
+    @staticmethod
+    def reserve(edges, throughput):
+        for edge in edges:
+            if throughput > edge.get_available_capacity():
+                return False
+
+        for edge in edges:
+            edge.add_capacity(throughput)
+        return True
+
+    @staticmethod
+    def release(edges, throughput):
+        for edge in edges:
+            edge.remove_capacity(throughput)
+
+    def __path(self, start_node_id, end_node_id, previous):
+        nodes, edges = [self.grid.nodes[end_node_id]], []
+
+        while nodes[-1].node_id != start_node_id:
+            node_id, edge = previous[nodes[-1].node_id]
+            nodes.append(self.grid.nodes[node_id])
+            edges.append(edge)
+
+        return nodes[::-1], edges[::-1]
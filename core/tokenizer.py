@@ -0,0 +1,257 @@
+from utils.exceptions import ParseException
+import numpy as np
+import re
+
+
+class Token(object):
+    NUMBER = 'number'
+    NAME = 'name'
+    SYMBOL = 'symbol'
+    END = 'end'
+
+    def __init__(self, kind, value, line, column):
+        self.kind = kind
+        self.value = value
+        self.line = line
+        self.column = column
+
+    def __repr__(self):
+        return '{0}({1!r}) at {2}:{3}'.format(self.kind, self.value, self.line, self.column)
+
+
+class Tokenizer(object):
+    chunk_size = 1 << 16
+
+    token_pattern = re.compile(r'''
+        (?P<skip>\s+|/\*.*?\*/|//[^\n]*)
+        |(?P<number>[-+]?[\d.][A-Za-z\d.+-]*)
+        |(?P<name>[A-Za-z_]\w*)
+        |(?P<symbol>[=;\[\]{}<>,])
+    ''', re.VERBOSE | re.DOTALL)
+
+    plain_numbers_pattern = re.compile(r'[\d\s,.eE+-]*')
+    plain_groups_pattern = re.compile(r'[\d\s,.eE+\-\[\]<>]*')
+    first_groups_pattern = re.compile(rb'(?:N(?:,N)*,?)?C(?:,?O(?:N(?:,N)*,?)?C)*')
+    groups_pattern = re.compile(rb'(?:,?O(?:N(?:,N)*,?)?C)*')
+    whitespace_codes = np.array([ord(character) for character in ' \t\r\n\x0b\x0c'], dtype=np.uint8)
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+        self.line = 1
+        self.column = 1
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            if self.position == len(self.buffer) and not self.__fill():
+                return Token(Token.END, None, self.line, self.column)
+
+            match = self.token_pattern.match(self.buffer, self.position)
+
+            if match is None or (match.end() == len(self.buffer) and not self.eof):
+                if self.__fill():
+                    continue
+                if match is None and self.buffer.startswith('/*', self.position):
+                    raise ParseException('Unterminated comment', self.line, self.column)
+                if match is None:
+                    raise ParseException(
+                        'Unexpected character {0!r}'.format(self.buffer[self.position]), self.line, self.column
+                    )
+
+            kind = match.lastgroup
+            text = match.group(kind)
+            token = Token(kind, text, self.line, self.column)
+
+            self.position = match.end()
+            self.__advance(text)
+
+            if kind == 'skip':
+                continue
+            if kind == Token.NUMBER:
+                try:
+                    token.value = float(text)
+                except ValueError:
+                    raise ParseException('Malformed number {0!r}'.format(text), token.line, token.column)
+
+            return token
+
+    def read_numbers(self, closing_symbol):
+        numbers = []
+
+        while True:
+            end = self.buffer.find(closing_symbol, self.position)
+            limit = end if end != -1 else self.buffer.rfind(',', self.position)
+
+            if limit == -1:
+                if self.__fill():
+                    continue
+                break
+
+            plain_end = self.plain_numbers_pattern.match(self.buffer, self.position, limit).end()
+            text = self.buffer[self.position:plain_end]
+            last_comma = text.rfind(',')
+            if last_comma != -1 and text[last_comma + 1:].strip() == '':
+                text = text[:last_comma]
+            numbers.append(self.__split_numbers(text))
+
+            self.position += len(text)
+            self.__advance(text)
+
+            if end != -1 or plain_end < limit or not self.__fill():
+                break
+
+        return np.concatenate(numbers) if len(numbers) > 0 else np.empty(0)
+
+    def read_groups(self, opening_symbol, closing_symbol, terminator):
+        end_pattern = re.compile(re.escape(closing_symbol) + r'[\s,]*' + re.escape(terminator))
+        numbers, widths = [], []
+
+        while True:
+            end = end_pattern.search(self.buffer, self.position)
+            if end is not None:
+                limit = end.start() + 1
+            else:
+                next_group = self.buffer.rfind(opening_symbol, self.position)
+                limit = self.buffer.rfind(closing_symbol, self.position, max(next_group, 0)) + 1
+
+            if limit <= self.position:
+                if self.__fill():
+                    continue
+                break
+
+            plain_end = self.plain_groups_pattern.match(self.buffer, self.position, limit).end()
+            if plain_end < limit:
+                limit = self.buffer.rfind(closing_symbol, self.position, plain_end) + 1
+                if limit <= self.position:
+                    break
+
+            text = self.buffer[self.position:limit]
+            group_numbers, group_widths = self.__split_groups(text, opening_symbol, closing_symbol, len(widths) == 0)
+            numbers.append(group_numbers)
+            widths.append(group_widths)
+
+            self.position = limit
+            self.__advance(text)
+
+            if plain_end < limit or end is not None or not self.__fill():
+                break
+
+        if len(widths) == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        return np.concatenate(numbers), np.concatenate(widths)
+
+    def __split_numbers(self, text):
+        pieces = text.split(',')
+        if pieces[0].strip() != '':
+            self.__error_at(text, 0, 'Expected \',\' between numbers')
+
+        return self.__to_floats(pieces[1:], text, [len(piece) + 1 for piece in pieces[:-1]])
+
+    def __split_groups(self, text, opening_symbol, closing_symbol, first):
+        characters = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        is_opening = characters == ord(opening_symbol)
+        is_closing = characters == ord(closing_symbol)
+        is_comma = characters == ord(',')
+        is_separator = is_opening | is_closing | is_comma | np.isin(characters, self.whitespace_codes)
+
+        number_starts = ~is_separator & np.concatenate(([True], is_separator[:-1]))
+        is_symbol = is_opening | is_closing | is_comma | number_starts
+        symbols = np.select(
+            [is_opening, is_closing, number_starts], [ord('O'), ord('C'), ord('N')], characters.astype(np.int64)
+        )
+
+        pattern = self.first_groups_pattern if first else self.groups_pattern
+        match = pattern.match(symbols[is_symbol].astype(np.uint8).tobytes())
+        matched = match.end() if match is not None else 0
+        if matched < is_symbol.sum():
+            self.__error_at(text, int(np.flatnonzero(is_symbol)[matched]), 'Malformed {0}...{1} group'.format(
+                opening_symbol, closing_symbol
+            ))
+
+        groups = int(is_closing.sum())
+        widths = np.bincount(np.cumsum(is_closing)[number_starts], minlength=groups)[:groups]
+
+        for symbol in (opening_symbol, closing_symbol, ','):
+            text = text.replace(symbol, ' ')
+        number_positions = np.flatnonzero(number_starts)
+
+        return self.__to_floats(text.split(), text, np.diff(number_positions, prepend=0)), widths
+
+    def __to_floats(self, pieces, text, offsets):
+        try:
+            return np.array(pieces, dtype=float)
+        except ValueError:
+            pass
+
+        position = 0
+        for piece, offset in zip(pieces, offsets):
+            position += offset
+            if piece.strip() == '':
+                self.__error_at(text, position, 'Expected a number')
+            try:
+                float(piece)
+            except ValueError:
+                self.__error_at(text, position, 'Malformed number {0!r}'.format(piece.strip()))
+
+    def __error_at(self, text, index, message):
+        line, column = self.line, self.column
+        newlines = text.count('\n', 0, index)
+        if newlines > 0:
+            line += newlines
+            column = index - text.rfind('\n', 0, index)
+        else:
+            column += index
+
+        raise ParseException(message, line, column)
+
+    def __fill(self):
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(self.chunk_size)
+        if len(chunk) == 0:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def __advance(self, text):
+        newlines = text.count('\n')
+        if newlines > 0:
+            self.line += newlines
+            self.column = len(text) - text.rfind('\n')
+        else:
+            self.column += len(text)
+
+
+class ArrayBuilder(object):
+
+    def __init__(self, capacity=64):
+        self.values = np.empty(max(capacity, 1), dtype=float)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.values):
+            self.values = np.resize(self.values, 2 * len(self.values))
+
+        self.values[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        if self.size + len(values) > len(self.values):
+            self.values = np.resize(self.values, max(2 * len(self.values), self.size + len(values)))
+
+        self.values[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    def build(self, shape=None):
+        values = self.values[:self.size]
+        return values if shape is None else values.reshape(shape)
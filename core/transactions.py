@@ -0,0 +1,72 @@
+class ChangeLog(object):
+    PLACE = 'place'
+    UNPLACE = 'unplace'
+    ROUTE = 'route'
+    UNROUTE = 'unroute'
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.entries = []
+        self.checkpoints = []
+        self.replaying = False
+
+    def rebuild(self):
+        self.entries = []
+        self.checkpoints = []
+
+    def is_recording(self):
+        return len(self.checkpoints) > 0 and not self.replaying
+
+    def checkpoint(self):
+        self.checkpoints.append(len(self.entries))
+        return len(self.checkpoints)
+
+    def commit(self):
+        assert len(self.checkpoints) > 0, 'There is no checkpoint to commit.'
+        self.checkpoints.pop()
+
+        if len(self.checkpoints) == 0:
+            self.entries = []
+
+    def rollback(self):
+        assert len(self.checkpoints) > 0, 'There is no checkpoint to roll back to.'
+        checkpoint = self.checkpoints.pop()
+
+        self.replaying = True
+        try:
+            while len(self.entries) > checkpoint:
+                self.__undo(*self.entries.pop())
+        finally:
+            self.replaying = False
+
+    def __undo(self, operation, target, item, throughput):
+        if operation == self.PLACE:
+            target.remove_component(item)
+        elif operation == self.UNPLACE:
+            target.add_component(item)
+        elif operation == self.ROUTE:
+            self.grid.remove_link_route(target, throughput)
+        else:
+            self.grid.add_link_route(target, item, throughput)
+
+    def on_component_added(self, server, component):
+        if self.is_recording():
+            self.entries.append((self.PLACE, server, component, None))
+
+    def on_component_removed(self, server, component):
+        if self.is_recording():
+            self.entries.append((self.UNPLACE, server, component, None))
+
+    def on_route_added(self, link, nodes, edges, throughput):
+        if self.is_recording():
+            self.entries.append((self.ROUTE, link, nodes, throughput))
+
+    def on_route_removed(self, link, nodes, edges, throughput):
+        if self.is_recording():
+            self.entries.append((self.UNROUTE, link, nodes, throughput))
+
+    def on_service_chain_added(self, service_chain, components, link_demands):
+        pass
+
+    def on_service_chain_removed(self, service_chain, components, link_demands):
+        pass
@@ -1,27 +1,43 @@
 from core.problem import Problem, WriterService
-from algorithms.greedy import GreedyHeuristic
+from algorithms.parallel import ParallelRestartSearch
+from core.archive import SolutionArchive
+from utils.instrumentation import instrumentation
+import argparse
+import logging
 
 
 def main():
+    arg_parser = argparse.ArgumentParser(description='Search for a low power VNF placement.')
+    arg_parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    arg_parser.add_argument('--metrics', action='store_true', help='collect phase timers and counters')
+    arg_parser.add_argument('--profile', choices=['cpu', 'memory', 'all'], help='profile the search workers')
+    arg_parser.add_argument('--archive', default='solutions/archive', help='directory of improving solutions')
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level), format='%(message)s')
+    if args.metrics:
+        instrumentation.enable()
+
     problem = Problem(file_path='data/instance.txt')
+    problem.init()
 
-    for i in range(1000000):
-        problem.init()
+    archive = SolutionArchive(args.archive)
+    search = ParallelRestartSearch(
+        problem, target_cost=4085, max_iterations=1000000, archive=archive, profile=args.profile
+    )
+    cost = search.run()
+    print('Cost: {0} after {1} iterations\n'.format(cost, search.iterations))
 
-        greedy = GreedyHeuristic(problem)
-        greedy.deploy_components()
-        greedy.deploy_routes()
-        cost = problem.fitness()
-        print('Cost: {0}\n'.format(cost))
+    if args.metrics or args.profile is not None:
+        instrumentation.log_report()
 
-        if cost < 4085:
-            problem.constraint_service.check_all()
-            problem.constraint_service.print_al_constraints()
+    if cost < 4085:
+        problem.constraint_service.check_all()
+        problem.constraint_service.print_al_constraints()
 
-            print()
-            writer = WriterService(problem)
-            writer.write(file_path='solutions/solution.txt')
-            break
+        print()
+        writer = WriterService(problem)
+        writer.write(file_path='solutions/solution.txt')
 
 
 if __name__ == '__main__':
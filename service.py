@@ -0,0 +1,511 @@
+from algorithms.greedy import GreedyHeuristic
+from algorithms.annealing import SimulatedAnnealing
+from algorithms.lns import AdaptiveLargeNeighbourhoodSearch
+from core.parser import Parser
+from core.problem import Problem, WriterService
+from utils.exceptions import ParseException
+from collections import OrderedDict
+import multiprocessing
+import argparse
+import tempfile
+import asyncio
+import hashlib
+import logging
+import random
+import json
+import time
+import io
+import os
+
+logger = logging.getLogger(__name__)
+
+algorithms = {
+    'greedy': GreedyHeuristic,
+    'annealing': SimulatedAnnealing,
+    'lns': AdaptiveLargeNeighbourhoodSearch
+}
+
+worker_problems = OrderedDict()
+worker_cache_size = 4
+
+
+def run_worker(connection, cancel_event, cache_size):
+    global worker_cache_size
+
+    worker_cache_size = cache_size
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+
+        job_id = request[0]
+        try:
+            connection.send((job_id, 'result', solve_job(*request, cancel_event=cancel_event, connection=connection)))
+        except Exception as error:
+            connection.send((job_id, 'error', '{0}: {1}'.format(type(error).__name__, error)))
+
+
+def get_worker_problem(instance_hash, data):
+    problem = worker_problems.pop(instance_hash, None)
+    if problem is None:
+        problem = Problem(instance_hash)
+        problem.build(data)
+    else:
+        problem.init()
+
+    worker_problems[instance_hash] = problem
+    while len(worker_problems) > worker_cache_size:
+        worker_problems.popitem(last=False)
+
+    return problem
+
+
+def write_solution(problem, solution):
+    problem.grid.load_solution(*solution)
+    output = io.StringIO()
+    WriterService(problem).write_to(output)
+    return output.getvalue()
+
+
+def render_solution(instance_hash, data, solution):
+    problem = Problem(instance_hash)
+    problem.build(data)
+    return write_solution(problem, solution)
+
+
+def solve_job(job_id, instance_hash, data, algorithm, seed, time_limit, max_iterations, cancel_event, connection):
+    deadline = time.time() + time_limit
+    problem = get_worker_problem(instance_hash, data)
+    random.seed(seed)
+
+    def should_stop():
+        return cancel_event.is_set() or time.time() > deadline
+
+    best_key, best_cost, best_solution = None, None, None
+    iterations = 0
+
+    while max_iterations is None or iterations < max_iterations:
+        if should_stop():
+            break
+
+        problem.init()
+        search = algorithms[algorithm](problem)
+        search.stop_condition = should_stop
+        search.deploy_components()
+        search.deploy_routes()
+        iterations += 1
+
+        cost = problem.fitness()
+        feasible = problem.constraint_service.is_feasible()
+        if best_key is None or (not feasible, cost) < best_key:
+            best_key, best_cost, best_solution = (not feasible, cost), cost, problem.grid.dump_solution()
+            connection.send((job_id, 'progress', {
+                'cost': cost, 'feasible': feasible, 'iterations': iterations, 'solution': best_solution
+            }))
+
+    state = 'cancelled' if cancel_event.is_set() else 'done'
+    solution = write_solution(problem, best_solution) if best_solution is not None else None
+    feasible = best_key is not None and not best_key[0]
+    return state, best_cost, feasible, iterations, solution
+
+
+class WorkerProcess(object):
+
+    def __init__(self, cache_size):
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.cancel_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=run_worker, args=(worker_connection, self.cancel_event, cache_size), daemon=True
+        )
+        self.process.start()
+        worker_connection.close()
+
+    def submit(self, job):
+        self.cancel_event.clear()
+        self.connection.send((
+            job.job_id, job.instance_hash, job.data, job.algorithm, job.seed, job.time_limit, job.max_iterations
+        ))
+
+    async def receive(self, loop, timeout):
+        if not self.connection.poll():
+            readable = loop.create_future()
+            loop.add_reader(self.connection.fileno(), lambda: readable.done() or readable.set_result(None))
+            try:
+                await asyncio.wait_for(readable, timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                loop.remove_reader(self.connection.fileno())
+
+        return self.connection.recv()
+
+    def terminate(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+class Job(object):
+    finished_states = ('done', 'cancelled', 'timeout', 'failed')
+
+    def __init__(self, job_id, instance_hash, algorithm, seed, time_limit, max_iterations):
+        self.job_id = job_id
+        self.instance_hash = instance_hash
+        self.algorithm = algorithm
+        self.seed = seed
+        self.time_limit = time_limit
+        self.max_iterations = max_iterations
+        self.cancel_event = None
+        self.data = None
+
+        self.state = 'queued'
+        self.best_cost = None
+        self.feasible = None
+        self.iterations = 0
+        self.solution = None
+        self.best_solution = None
+        self.error = None
+        self.subscribers = []
+
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def is_finished(self):
+        return self.state in self.finished_states
+
+    def to_dict(self, solution=False):
+        job = {
+            'job': self.job_id,
+            'state': self.state,
+            'instance': self.instance_hash,
+            'algorithm': self.algorithm,
+            'seed': self.seed,
+            'time_limit': self.time_limit,
+            'cost': self.best_cost,
+            'feasible': self.feasible,
+            'iterations': self.iterations,
+            'elapsed': (self.finished or time.time()) - (self.started or self.created)
+        }
+        if self.error is not None:
+            job['error'] = self.error
+        if solution:
+            job['solution'] = self.solution
+
+        return job
+
+
+class SolveService(object):
+
+    def __init__(self, workers=None, time_limit=30.0, max_time_limit=600.0, cache_size=8, history=256,
+                 grace_period=5.0):
+        assert time_limit > 0, 'Time limit should be positive.'
+        assert max_time_limit >= time_limit, 'Maximum time limit should not be lower then the default.'
+
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.time_limit = time_limit
+        self.max_time_limit = max_time_limit
+        self.cache_size = cache_size
+        self.history = history
+        self.grace_period = grace_period
+
+        self.topologies = OrderedDict()
+        self.jobs = OrderedDict()
+        self.next_job_id = 1
+
+        self.queue = None
+        self.tasks = []
+        self.loop = None
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.tasks = [asyncio.ensure_future(self.__dispatch()) for i in range(self.workers)]
+
+    async def stop(self):
+        for job in self.jobs.values():
+            if job.cancel_event is not None and not job.is_finished():
+                job.cancel_event.set()
+
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def submit(self, instance=None, path=None, algorithm='greedy', seed=None, time_limit=None,
+                     max_iterations=None):
+        assert (instance is None) != (path is None), 'Either an instance payload or a path is needed.'
+        assert algorithm in algorithms, 'Unknown algorithm {0}.'.format(algorithm)
+
+        time_limit = self.time_limit if time_limit is None else min(float(time_limit), self.max_time_limit)
+        assert time_limit > 0, 'Time limit should be positive.'
+
+        if path is not None:
+            with open(path, 'rb') as instance_file:
+                content = instance_file.read()
+        else:
+            content = instance.encode()
+
+        instance_hash = hashlib.sha1(content).hexdigest()
+        cached = instance_hash in self.topologies
+        if not cached:
+            self.topologies[instance_hash] = await self.loop.run_in_executor(None, self.__parse, content)
+        self.topologies.move_to_end(instance_hash)
+        data = self.topologies[instance_hash]
+        while len(self.topologies) > self.cache_size:
+            self.topologies.popitem(last=False)
+
+        job = Job(
+            self.next_job_id, instance_hash, algorithm, seed if seed is not None else random.randrange(2 ** 32),
+            time_limit, max_iterations
+        )
+        job.data = data
+        self.next_job_id += 1
+        self.jobs[job.job_id] = job
+        self.__prune()
+
+        await self.queue.put(job)
+        logger.info('Job %d queued (%s, instance %s, cached %s)', job.job_id, algorithm, instance_hash[:12], cached)
+
+        return job, cached
+
+    def cancel(self, job_id):
+        job = self.jobs[job_id]
+        if job.state == 'queued':
+            self.__finish(job, 'cancelled')
+        elif job.state == 'running':
+            job.cancel_event.set()
+
+        return job
+
+    def subscribe(self, job_id, outbox):
+        job = self.jobs[job_id]
+        if job.is_finished():
+            outbox.put_nowait(self.__event(job, 'finished'))
+        else:
+            job.subscribers.append(outbox)
+
+        return job
+
+    def unsubscribe(self, outbox):
+        for job in self.jobs.values():
+            if outbox in job.subscribers:
+                job.subscribers.remove(outbox)
+
+    async def __dispatch(self):
+        worker = WorkerProcess(self.cache_size)
+        try:
+            while True:
+                job = await self.queue.get()
+                if job.is_finished():
+                    continue
+
+                job.state = 'running'
+                job.started = time.time()
+                job.cancel_event = worker.cancel_event
+                self.__publish(job, self.__event(job, 'started'))
+
+                worker.submit(job)
+                if not await self.__follow(job, worker):
+                    worker.terminate()
+                    worker = WorkerProcess(self.cache_size)
+                    await self.__time_out(job)
+                job.data = None
+        finally:
+            worker.terminate()
+
+    async def __follow(self, job, worker):
+        deadline = job.started + job.time_limit + self.grace_period
+
+        while True:
+            try:
+                message = await worker.receive(self.loop, deadline - time.time())
+            except (EOFError, OSError) as error:
+                job.error = 'Worker exited: {0}'.format(type(error).__name__)
+                self.__finish(job, 'failed')
+                return False
+            if message is None:
+                return False
+
+            job_id, kind, values = message
+            if kind == 'progress':
+                job.best_cost, job.feasible, job.iterations = values['cost'], values['feasible'], values['iterations']
+                job.best_solution = values['solution']
+                self.__publish(job, self.__event(job, kind))
+            elif kind == 'error':
+                job.error = values
+                self.__finish(job, 'failed')
+                return True
+            else:
+                state, job.best_cost, job.feasible, job.iterations, job.solution = values
+                self.__finish(job, state)
+                return True
+
+    async def __time_out(self, job):
+        if job.is_finished():
+            return
+
+        if job.best_solution is not None:
+            job.solution = await self.loop.run_in_executor(
+                None, render_solution, job.instance_hash, job.data, job.best_solution
+            )
+        self.__finish(job, 'timeout')
+
+    def __finish(self, job, state):
+        if job.is_finished():
+            return
+
+        job.state = state
+        job.finished = time.time()
+        logger.info('Job %d %s: cost %s after %d iterations', job.job_id, state, job.best_cost, job.iterations)
+
+        self.__publish(job, self.__event(job, 'finished'))
+        job.subscribers = []
+
+    def __publish(self, job, event):
+        for outbox in job.subscribers:
+            outbox.put_nowait(event)
+
+    def __event(self, job, kind):
+        event = job.to_dict(solution=kind == 'finished')
+        event['event'] = kind
+        return event
+
+    def __prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.is_finished()]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
+
+    @staticmethod
+    def __parse(content):
+        with tempfile.NamedTemporaryFile(suffix='.instance') as instance_file:
+            instance_file.write(content)
+            instance_file.flush()
+
+            parser = Parser(instance_file.name)
+            parser.parse()
+
+        return parser.get_parsed_data()
+
+
+class SolveServer(object):
+
+    def __init__(self, service, socket_path=None, host='127.0.0.1', port=8765):
+        self.service = service
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def serve(self):
+        await self.service.start()
+
+        if self.socket_path is not None:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self.server = await asyncio.start_unix_server(self.handle, path=self.socket_path, limit=2 ** 26)
+            logger.info('Listening on %s', self.socket_path)
+        else:
+            self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=2 ** 26)
+            logger.info('Listening on %s:%d', self.host, self.port)
+
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.service.stop()
+
+    async def handle(self, reader, writer):
+        outbox = asyncio.Queue()
+        sender = asyncio.ensure_future(self.__send(outbox, writer))
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    await self.__handle_request(line, outbox)
+        finally:
+            self.service.unsubscribe(outbox)
+            await outbox.put(None)
+            await sender
+            writer.close()
+
+    async def __handle_request(self, line, outbox):
+        try:
+            request = json.loads(line)
+            operation = request.get('op')
+
+            if operation == 'submit':
+                job, cached = await self.service.submit(
+                    instance=request.get('instance'), path=request.get('path'),
+                    algorithm=request.get('algorithm', 'greedy'), seed=request.get('seed'),
+                    time_limit=request.get('time_limit'), max_iterations=request.get('max_iterations')
+                )
+                response = job.to_dict()
+                response.update({'event': 'queued', 'cached': cached})
+                await outbox.put(response)
+
+                if request.get('stream', True):
+                    self.service.subscribe(job.job_id, outbox)
+            elif operation == 'watch':
+                self.service.subscribe(request['job'], outbox)
+            elif operation == 'cancel':
+                response = self.service.cancel(request['job']).to_dict()
+                response['event'] = 'status'
+                await outbox.put(response)
+            elif operation == 'status':
+                if 'job' in request:
+                    response = self.service.jobs[request['job']].to_dict(solution=request.get('solution', False))
+                    response['event'] = 'status'
+                else:
+                    response = {'event': 'jobs', 'jobs': [job.to_dict() for job in self.service.jobs.values()]}
+                await outbox.put(response)
+            else:
+                raise ValueError('Unknown operation {0!r}'.format(operation))
+        except (AssertionError, KeyError, ValueError, OSError, ParseException) as error:
+            await outbox.put({'event': 'error', 'message': '{0}: {1}'.format(type(error).__name__, error)})
+
+    async def __send(self, outbox, writer):
+        while True:
+            message = await outbox.get()
+            if message is None:
+                break
+
+            writer.write(json.dumps(message).encode() + b'\n')
+            try:
+                await writer.drain()
+            except ConnectionError:
+                break
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Serve VNF placement solve jobs over a JSON lines socket.')
+    arg_parser.add_argument('--socket', help='listen on a Unix socket instead of TCP')
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8765)
+    arg_parser.add_argument('--workers', type=int, help='solver processes (default: CPU count)')
+    arg_parser.add_argument('--time-limit', type=float, default=30.0, help='default time limit of a job in seconds')
+    arg_parser.add_argument('--max-time-limit', type=float, default=600.0)
+    arg_parser.add_argument('--cache-size', type=int, default=8, help='parsed topologies kept per process')
+    arg_parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level), format='%(message)s')
+
+    service = SolveService(
+        workers=args.workers, time_limit=args.time_limit, max_time_limit=args.max_time_limit,
+        cache_size=args.cache_size
+    )
+    server = SolveServer(service, socket_path=args.socket, host=args.host, port=args.port)
+
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
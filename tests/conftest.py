@@ -0,0 +1,17 @@
+from core.problem import Problem
+import pytest
+import random
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def problem():
+    random.seed(0)
+    problem = Problem(os.path.join(ROOT, 'data', 'instance.txt'))
+    problem.init()
+    return problem
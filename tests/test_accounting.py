@@ -0,0 +1,79 @@
+from algorithms.greedy import GreedyHeuristic
+import pytest
+import random
+
+
+def full_power(grid):
+    active_edges = set()
+    active_node_ids = set(server.node_id for server in grid.servers if server.is_active())
+    for link_demand in grid.link_demands:
+        active_edges.update(link_demand.link.edges)
+        active_node_ids.update(node.node_id for node in link_demand.link.nodes)
+
+    power = sum(edge.power_usage for edge in active_edges)
+    power += sum(grid.nodes[node_id].power_usage for node_id in active_node_ids)
+    for server in grid.servers:
+        if server.is_active():
+            resources_used = sum(component.resources_needed for component in server.components)
+            power += server.min_power + (server.max_power - server.min_power) / server.max_resources * resources_used
+    return power
+
+
+def test_ledger_matches_full_recomputation_after_greedy(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    assert problem.fitness() == pytest.approx(full_power(problem.grid))
+
+
+def test_ledger_matches_full_recomputation_after_moves(problem):
+    grid = problem.grid
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    for _ in range(200):
+        link_demand = random.choice(grid.link_demands)
+        if len(link_demand.link.nodes) > 0:
+            grid.remove_link_route(link_demand.link, link_demand.throughput)
+
+        component = random.choice(grid.components)
+        server = grid.servers[component.server_id]
+        server.remove_component(component)
+        target = random.choice([candidate for candidate in grid.servers if candidate.can_host(component)] + [server])
+        target.add_component(component)
+
+        assert problem.fitness() == pytest.approx(full_power(grid))
+
+    greedy.route_demands([link_demand for link_demand in grid.link_demands if len(link_demand.link.nodes) == 0])
+    assert problem.fitness() == pytest.approx(full_power(grid))
+
+
+def test_ledger_is_rebuilt_on_reset(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    problem.init()
+
+    assert problem.fitness() == 0
+    assert full_power(problem.grid) == 0
+
+
+def test_active_indexes_follow_placement(problem):
+    grid = problem.grid
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+
+    for _ in range(200):
+        component = random.choice(grid.components)
+        if component.is_deployed_on_server():
+            grid.servers[component.server_id].remove_component(component)
+        if random.random() < 0.5:
+            random.choice(grid.servers).add_component(component)
+
+        active_servers = [server for server in grid.servers if server.is_active()]
+        assert sorted(grid.ledger.active_servers, key=lambda x: x.server_id) == active_servers
+        assert sorted(node.node_id for node in grid.ledger.active_server_nodes) == \
+            sorted(set(server.node_id for server in active_servers))
@@ -0,0 +1,16 @@
+from algorithms.annealing import SimulatedAnnealing
+import pytest
+
+
+def test_annealing_starts_from_the_best_restart_and_never_gets_worse(problem):
+    annealing = SimulatedAnnealing(problem, iterations=2000, restarts=5)
+    annealing.deploy_components()
+    start_cost = problem.fitness()
+
+    assert problem.constraint_service.is_feasible()
+
+    annealing.deploy_routes()
+
+    assert problem.fitness() <= start_cost + 1e-9
+    assert problem.fitness() == pytest.approx(annealing.best_cost)
+    assert problem.constraint_service.is_feasible()
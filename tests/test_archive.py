@@ -0,0 +1,11 @@
+from core.archive import SolutionArchive
+
+
+def test_best_skips_infeasible_and_unknown_entries(tmp_path):
+    archive = SolutionArchive(str(tmp_path))
+    archive.add([0, 1], [[], []], cost=10, feasible=True)
+    archive.add([1, 1], [[], []], cost=5, feasible=None)
+    archive.add([1, 0], [[], []], cost=1, feasible=False)
+
+    assert archive.best()['cost'] == 10
+    assert archive.best(feasible_only=False)['cost'] == 1
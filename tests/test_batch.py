@@ -0,0 +1,35 @@
+from algorithms.greedy import GreedyHeuristic
+from core.batch import GridArrays, BatchEvaluator
+import numpy as np
+import pytest
+
+
+def test_batch_evaluator_matches_grid_fitness(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    evaluator = BatchEvaluator(GridArrays(problem.grid))
+    placement, choices = evaluator.encode(problem.grid)
+    fitness, violations = evaluator.evaluate(placement[None, :], choices[None, :])
+
+    assert fitness[0] == pytest.approx(problem.fitness())
+    assert violations[0].sum() == problem.constraint_service.violation_count()
+
+
+def test_batch_evaluator_scores_each_candidate_independently(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    evaluator = BatchEvaluator(GridArrays(problem.grid))
+    placement, choices = evaluator.encode(problem.grid)
+    undeployed = placement.copy()
+    undeployed[0] = -1
+
+    fitness, violations = evaluator.evaluate(np.stack([placement, undeployed]), np.stack([choices, choices]))
+    single_fitness, single_violations = evaluator.evaluate(undeployed[None, :], choices[None, :])
+
+    assert fitness[1] == pytest.approx(single_fitness[0])
+    assert np.array_equal(violations[1], single_violations[0])
+    assert violations[1][0] == 1
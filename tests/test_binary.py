@@ -0,0 +1,20 @@
+from core.binary import BinaryInstance
+import numpy as np
+import pytest
+
+
+def test_scalars_keep_their_type(tmp_path):
+    file_path = str(tmp_path / 'instance.bin')
+    BinaryInstance.write({'n': 3, 'delay': 2.5, 'power': np.float64(7.0), 'capacity': np.array([1.5, 2.0])}, file_path)
+
+    data = BinaryInstance.read(file_path)
+
+    assert data['n'] == 3 and isinstance(data['n'], int)
+    assert data['delay'] == 2.5
+    assert data['power'] == 7.0 and isinstance(data['power'], float)
+    assert np.array_equal(data['capacity'], [1.5, 2.0])
+
+
+def test_non_numeric_scalars_are_rejected(tmp_path):
+    with pytest.raises(AssertionError):
+        BinaryInstance.write({'name': 'ring'}, str(tmp_path / 'instance.bin'))
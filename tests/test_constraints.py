@@ -0,0 +1,90 @@
+from algorithms.greedy import GreedyHeuristic
+from core.problem import ConstraintService
+import random
+
+
+def expected_violations(grid):
+    return {
+        'components': sorted(
+            component.component_id for component in grid.components if not component.is_deployed_on_server()
+        ),
+        'servers': sorted(
+            server.server_id for server in grid.servers if server.is_using_more_resources_then_available()
+        ),
+        'edges': sorted(
+            (edge.start_node.node_id, edge.end_node.node_id) for edge in grid.edges
+            if edge.capacity_used > edge.capacity
+        ),
+        'service_chains': sorted(
+            index for index, service_chain in enumerate(grid.service_chains)
+            if not service_chain.link_delays_are_within_max_delay()
+        ),
+        'link_demands': sorted(
+            index for index, link_demand in enumerate(grid.link_demands)
+            if link_demand.get_route_length() == 0 and
+            not grid.are_components_on_same_node(link_demand.link.start_component, link_demand.link.end_component)
+        )
+    }
+
+
+def assert_matches_full_check(problem):
+    incremental, full = problem.constraint_service, ConstraintService(problem.grid)
+
+    assert incremental.violations() == expected_violations(problem.grid)
+    for (check, description), (full_check, _) in zip(incremental.constraints, full.constraints):
+        assert check() == full_check(), description
+    assert incremental.check_all() == full.check_all()
+
+
+def test_violations_track_greedy_placement(problem):
+    assert_matches_full_check(problem)
+
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    assert_matches_full_check(problem)
+
+    greedy.deploy_routes()
+    assert_matches_full_check(problem)
+    assert problem.constraint_service.is_feasible()
+
+
+def test_violations_track_overloads_and_unrouted_demands(problem):
+    grid = problem.grid
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    for _ in range(200):
+        link_demand = random.choice(grid.link_demands)
+        if len(link_demand.link.nodes) > 0:
+            grid.remove_link_route(link_demand.link, link_demand.throughput)
+
+        component = random.choice(grid.components)
+        if component.is_deployed_on_server():
+            grid.servers[component.server_id].remove_component(component)
+        if random.random() < 0.9:
+            random.choice(grid.servers).add_component(component)
+
+        assert_matches_full_check(problem)
+
+    assert not problem.constraint_service.is_feasible()
+
+
+def test_rollback_restores_violations(problem):
+    grid = problem.grid
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+    violations = problem.constraint_service.violations()
+
+    grid.checkpoint()
+    for link_demand in grid.link_demands[:10]:
+        if len(link_demand.link.nodes) > 0:
+            grid.remove_link_route(link_demand.link, link_demand.throughput)
+    for component in grid.components[:5]:
+        grid.servers[component.server_id].remove_component(component)
+    assert_matches_full_check(problem)
+
+    grid.rollback()
+    assert_matches_full_check(problem)
+    assert problem.constraint_service.violations() == violations
@@ -0,0 +1,30 @@
+from algorithms.greedy import GreedyHeuristic
+from benchmarks.generator import InstanceGenerator
+from benchmarks.suite import scales
+from core.entities import Server, Component
+from core.problem import Problem
+import random
+
+
+def test_fits_and_overload_agree_after_float_drift():
+    server = Server(0, 0, 10.0, 20.0, [1.8, 2.2])
+    for _ in range(3):
+        component = Component([0.6, 0.3])
+        assert server.can_host(component)
+        server.add_component(component)
+
+    assert not server.is_using_more_resources_then_available()
+    assert not server.can_host(Component([0.1, 0.1]))
+    assert server.residual_resources.tolist() == (server.resources_available - server.resources_used).tolist()
+
+
+def test_greedy_placement_never_overloads_a_server():
+    problem = Problem('large')
+    problem.build(InstanceGenerator(seed=0, **scales['large']).generate())
+    random.seed(0)
+    problem.init()
+
+    GreedyHeuristic(problem).deploy_components()
+
+    assert problem.constraint_service.servers_did_not_use_more_resources_then_they_have()
+    assert not any(server.is_using_more_resources_then_available() for server in problem.grid.servers)
@@ -0,0 +1,23 @@
+from benchmarks.generator import InstanceGenerator
+from benchmarks.suite import scales
+from core.problem import Problem
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('scale_name', ['small', 'medium'])
+def test_every_generated_demand_reaches_the_grid(scale_name):
+    data = InstanceGenerator(seed=0, **scales[scale_name]).generate()
+    problem = Problem(scale_name)
+    problem.build(data)
+
+    assert len(problem.grid.link_demands) == len(data['VmDemands'])
+
+
+def test_latency_budget_grows_with_chain_length():
+    data = InstanceGenerator(seed=0, **scales['small']).generate()
+    chain_demands = data['sc'][:, data['VmDemands'][:, 0].astype(int) - 1].sum(axis=1)
+
+    budget_per_demand = data['lat'] / np.maximum(chain_demands, 1)
+    assert np.allclose(budget_per_demand, budget_per_demand[0])
+    assert budget_per_demand[0] >= data['Edges'][:, 4].max()
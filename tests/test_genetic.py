@@ -0,0 +1,42 @@
+from algorithms.genetic import GeneticAlgorithm
+from algorithms.greedy import GreedyHeuristic
+from benchmarks.generator import InstanceGenerator
+from benchmarks.suite import scales
+from core.problem import Problem
+import pytest
+import random
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_genetic_algorithm_loads_its_best_individual_on_a_generated_instance(seed):
+    random.seed(seed)
+    problem = Problem('small')
+    problem.build(InstanceGenerator(seed=0, **scales['small']).generate())
+    grid = problem.grid
+
+    genetic = GeneticAlgorithm(problem, population_size=40, generations=30, seed=seed)
+    genetic.deploy_components()
+    genetic.deploy_routes()
+
+    assert problem.fitness() == pytest.approx(genetic.best_cost)
+    assert all(edge.capacity_used <= edge.capacity for edge in grid.edges)
+    assert set(genetic.unrouted_demands) <= problem.constraint_service.unmet_demands
+    assert all(len(link_demand.link.nodes) == 0 for link_demand in genetic.unrouted_demands)
+
+    unmet_demands = problem.constraint_service.violations()['link_demands']
+    assert genetic.best_violations[-1] == len(unmet_demands)
+
+
+def test_load_solution_reports_the_routes_that_do_not_fit(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    grid = problem.grid
+    solution = grid.dump_solution()
+    link_demand = next(link_demand for link_demand in grid.link_demands if len(link_demand.link.nodes) > 0)
+    link_demand.throughput = max(edge.capacity for edge in link_demand.link.edges) + 1
+
+    assert grid.load_solution(*solution) == [link_demand]
+    assert len(link_demand.link.nodes) == 0
+    assert all(edge.capacity_used <= edge.capacity for edge in grid.edges)
@@ -0,0 +1,27 @@
+from utils.instrumentation import Instrumentation
+import tracemalloc
+
+
+def profile(instrumentation, function):
+    instrumentation.start_capture(cpu=True, memory=True)
+    function()
+    instrumentation.stop_capture()
+    return instrumentation.capture_snapshot()
+
+
+def work():
+    return sorted(str(i) for i in range(1000))
+
+
+def test_worker_captures_merge_into_one_report():
+    first, second, merged = Instrumentation(), Instrumentation(), Instrumentation()
+
+    merged.merge_capture(*profile(first, work))
+    merged.merge_capture(*profile(second, work))
+
+    calls = [
+        stats[1] for function, stats in merged.profile_stats.stats.items() if function[2] == 'work'
+    ]
+    assert calls == [2]
+    assert not tracemalloc.is_tracing()
+    assert 'profile' in merged.report() and 'memory' in merged.report()
@@ -0,0 +1,38 @@
+from algorithms.lns import AdaptiveLargeNeighbourhoodSearch
+from algorithms.placement import PlacementEngine
+import numpy as np
+import pytest
+
+
+def test_lns_never_gets_worse_and_keeps_the_engine_in_sync(problem):
+    grid = problem.grid
+    lns = AdaptiveLargeNeighbourhoodSearch(problem, iterations=300)
+    lns.deploy_components()
+    lns.greedy.deploy_routes()
+    start_cost = problem.fitness()
+
+    lns.improve()
+
+    assert problem.fitness() <= start_cost + 1e-9
+    assert problem.fitness() == pytest.approx(lns.best_cost)
+    assert problem.constraint_service.is_feasible()
+
+    engine = lns.greedy.placement_engine()
+    fresh_engine = PlacementEngine(grid.servers, lns.greedy.packing, grid.component_demands)
+    assert np.allclose(engine.residuals, fresh_engine.residuals)
+    assert np.array_equal(engine.inactive, fresh_engine.inactive)
+    assert np.array_equal(engine.node_active_servers, fresh_engine.node_active_servers)
+    assert not engine.excluded.any()
+
+
+def test_repair_skips_the_emptied_servers(problem):
+    lns = AdaptiveLargeNeighbourhoodSearch(problem)
+    lns.deploy_components()
+    lns.greedy.deploy_routes()
+
+    for _ in range(20):
+        problem.grid.checkpoint()
+        components, link_demands, forbidden_servers = lns.empty_server()
+        if lns.repair(components, link_demands, forbidden_servers):
+            assert all(component.server_id != forbidden_servers[0].server_id for component in components)
+        problem.grid.rollback()
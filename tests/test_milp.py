@@ -0,0 +1,30 @@
+from algorithms.milp import MilpSolver
+import pytest
+
+pytest.importorskip('pulp')
+
+
+def test_solver_reports_the_incumbent_and_a_lower_bound(problem):
+    solver = MilpSolver(problem, time_limit=5)
+    solver.deploy_components()
+    solver.greedy.deploy_routes()
+    greedy_cost = problem.fitness()
+
+    best_cost, lower_bound = solver.solve()
+
+    assert solver.status in ('optimal', 'feasible')
+    assert problem.constraint_service.is_feasible()
+    assert best_cost == pytest.approx(problem.fitness())
+    assert best_cost <= greedy_cost + 1e-9
+    assert lower_bound <= best_cost + 1e-6
+
+
+def test_model_build_counts_against_the_time_limit(problem):
+    solver = MilpSolver(problem, time_limit=1e-9)
+    solver.deploy_components()
+    solver.greedy.deploy_routes()
+    greedy_cost = problem.fitness()
+
+    assert solver.solve() == (pytest.approx(greedy_cost), None)
+    assert solver.status == 'not solved'
+    assert problem.fitness() == pytest.approx(greedy_cost)
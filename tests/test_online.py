@@ -0,0 +1,127 @@
+from algorithms.greedy import GreedyHeuristic
+from core.accounting import UsageLedger
+from core.entities import Component, Link, LinkDemand, ServiceChain
+from test_constraints import assert_matches_full_check
+import pytest
+import random
+
+
+def new_service_chain(grid, oversized=False):
+    components = [Component([random.uniform(0.05, 0.3), random.uniform(0.05, 0.3)]) for _ in range(3)]
+    if oversized:
+        size = max(server.resources_available.max() for server in grid.servers) + 1
+        components[1] = Component([size, size])
+    shared = random.choice(grid.components)
+    link_demands = [
+        LinkDemand(Link(components[0], components[1]), 100),
+        LinkDemand(Link(components[1], components[2]), 50),
+        LinkDemand(Link(components[2], shared), 70)
+    ]
+    return ServiceChain(components + [shared], 20), link_demands
+
+
+def assert_consistent(problem):
+    grid = problem.grid
+
+    assert [component.component_id for component in grid.components] == list(range(len(grid.components)))
+    assert problem.fitness() == pytest.approx(UsageLedger(grid).total_power())
+    for component in grid.components:
+        assert set(grid.component_demands[component]) == set(
+            link_demand for link_demand in grid.link_demands
+            if component in (link_demand.link.start_component, link_demand.link.end_component)
+        )
+        assert set(grid.component_chains[component]) == set(
+            service_chain for service_chain in grid.service_chains if component in service_chain.components
+        )
+    for index, link_demand in enumerate(grid.link_demands):
+        assert grid.link_demand_index(link_demand) == index
+    for index, service_chain in enumerate(grid.service_chains):
+        assert grid.service_chain_index(service_chain) == index
+        assert service_chain.get_delay() == pytest.approx(sum(link.delay for link in service_chain.links))
+    assert_matches_full_check(problem)
+
+
+@pytest.fixture
+def greedy(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+    return greedy
+
+
+def test_added_service_chain_is_deployed(problem, greedy):
+    grid = problem.grid
+    service_chain, link_demands = new_service_chain(grid)
+
+    unplaced_components, empty_demands = greedy.add_service_chain(service_chain, link_demands)
+
+    assert unplaced_components == [] and empty_demands == []
+    assert all(component.is_deployed_on_server() for component in service_chain.components)
+    assert all(link_demand in grid.link_demands for link_demand in link_demands)
+    assert_consistent(problem)
+
+
+def test_oversized_component_is_reported_unplaced(problem, greedy):
+    grid = problem.grid
+    service_chain, link_demands = new_service_chain(grid, oversized=True)
+    oversized = service_chain.components[1]
+
+    unplaced_components, empty_demands = greedy.add_service_chain(service_chain, link_demands)
+
+    assert unplaced_components == [oversized]
+    assert set(empty_demands) == set(link_demands[:2])
+    assert all(len(link_demand.link.nodes) == 0 for link_demand in empty_demands)
+    assert service_chain in grid.service_chains
+    assert_consistent(problem)
+
+
+def test_removing_an_added_service_chain_restores_the_grid(problem, greedy):
+    grid = problem.grid
+    cost, solution = problem.fitness(), grid.dump_solution()
+    sizes = (len(grid.components), len(grid.link_demands), len(grid.service_chains))
+    service_chain, link_demands = new_service_chain(grid)
+
+    greedy.add_service_chain(service_chain, link_demands)
+    components, removed_demands = greedy.remove_service_chain(service_chain)
+
+    assert components == service_chain.components[:3]
+    assert removed_demands == link_demands
+    assert (len(grid.components), len(grid.link_demands), len(grid.service_chains)) == sizes
+    assert problem.fitness() == pytest.approx(cost)
+    assert grid.dump_solution() == solution
+    assert_consistent(problem)
+
+
+def test_removing_a_chain_removes_demands_between_components_that_stay(problem, greedy):
+    grid = problem.grid
+    cost, solution = problem.fitness(), grid.dump_solution()
+    capacity_used = sum(edge.capacity_used for edge in grid.edges)
+    sizes = (len(grid.components), len(grid.link_demands), len(grid.service_chains))
+
+    first, second = random.sample(random.choice(grid.service_chains).components, 2)
+    component = Component([0.1, 0.1])
+    link_demands = [LinkDemand(Link(component, first), 10), LinkDemand(Link(first, second), 10)]
+    service_chain = ServiceChain([component, first, second], 20)
+
+    greedy.add_service_chain(service_chain, link_demands)
+    components, removed_demands = greedy.remove_service_chain(service_chain)
+
+    assert components == [component]
+    assert removed_demands == link_demands
+    assert (len(grid.components), len(grid.link_demands), len(grid.service_chains)) == sizes
+    assert sum(edge.capacity_used for edge in grid.edges) == pytest.approx(capacity_used)
+    assert problem.fitness() == pytest.approx(cost)
+    assert grid.dump_solution() == solution
+    assert all(link_demands[1].link not in chain.links for chain in grid.service_chains)
+    assert_consistent(problem)
+
+
+def test_random_arrivals_and_departures_keep_state_consistent(problem, greedy):
+    grid = problem.grid
+
+    for _ in range(30):
+        if random.random() < 0.5 and len(grid.service_chains) > 1:
+            greedy.remove_service_chain(random.choice(grid.service_chains))
+        else:
+            greedy.add_service_chain(*new_service_chain(grid))
+        assert_consistent(problem)
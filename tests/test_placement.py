@@ -0,0 +1,79 @@
+from algorithms.greedy import GreedyHeuristic
+from algorithms.placement import PlacementEngine
+from core.entities import Server, Component, Link, LinkDemand
+import pytest
+
+
+def create_servers():
+    loose = Server(0, 2, 100.0, 300.0, [2.0, 2.0])
+    tight = Server(1, 1, 50.0, 100.0, [1.0, 1.0])
+    efficient = Server(2, 0, 20.0, 50.0, [1.0, 1.0])
+    tight.add_component(Component([0.5, 0.5]))
+    return loose, tight, efficient
+
+
+@pytest.mark.parametrize('strategy, expected', [
+    ('first_fit_decreasing', 0),
+    ('best_fit_decreasing', 1),
+    ('power_efficiency', 2)
+])
+def test_strategy_picks_its_server(strategy, expected):
+    servers = create_servers()
+    component = Component([0.4, 0.4])
+
+    assert PlacementEngine(servers, strategy).place([component]) == []
+    assert component.server_id == expected
+    assert not any(server.is_using_more_resources_then_available() for server in servers)
+
+
+def pack(strategy, sizes):
+    servers = [Server(0, 0, 10.0, 20.0, [1.0, 1.0]), Server(1, 1, 10.0, 20.0, [1.0, 1.0])]
+    unplaced_components = PlacementEngine(servers, strategy).place([Component([size, size]) for size in sizes])
+    return servers, unplaced_components
+
+
+@pytest.mark.parametrize('strategy', PlacementEngine.decreasing_strategies)
+def test_decreasing_strategies_place_the_largest_components_first(strategy):
+    servers, unplaced_components = pack(strategy, (0.4, 0.5, 0.5, 0.6))
+
+    assert unplaced_components == []
+    assert not any(server.is_using_more_resources_then_available() for server in servers)
+    assert len(pack('first_fit', (0.4, 0.5, 0.5, 0.6))[1]) == 1
+
+
+@pytest.mark.parametrize('packing', GreedyHeuristic.packings)
+def test_packing_never_overloads_a_server(problem, packing):
+    greedy = GreedyHeuristic(problem, packing)
+    greedy.deploy_components()
+
+    assert problem.constraint_service.components_are_deployed()
+    assert not any(server.is_using_more_resources_then_available() for server in problem.grid.servers)
+
+
+def test_affinity_keeps_a_heavy_pair_on_one_server():
+    servers = [Server(0, 0, 10.0, 20.0, [1.0, 1.0]), Server(1, 1, 10.0, 20.0, [1.0, 1.0])]
+    first, second, third = Component([0.5, 0.5], 0), Component([0.4, 0.4], 1), Component([0.3, 0.3], 2)
+    heavy, light = LinkDemand(Link(first, second), 100), LinkDemand(Link(second, third), 1)
+    component_demands = {first: [heavy], second: [heavy, light], third: [light]}
+
+    engine = PlacementEngine(servers, 'affinity', component_demands)
+
+    assert engine.cluster([first, second, third]) == [[first, second], [third]]
+    assert engine.place([third, second, first]) == []
+    assert first.server_id == second.server_id != third.server_id
+
+
+def test_affinity_co_locates_the_heaviest_demands(problem):
+    grid = problem.grid
+    greedy = GreedyHeuristic(problem, 'affinity')
+    greedy.deploy_components()
+    greedy.deploy_routes()
+
+    capacity = max(server.resources_available.max() for server in grid.servers)
+    heavy_demands = sorted(grid.link_demands, key=lambda x: -x.throughput)[:5]
+    for link_demand in heavy_demands:
+        link = link_demand.link
+        assert (link.start_component.resource_vector + link.end_component.resource_vector).max() < capacity
+        assert grid.are_components_on_same_node(link.start_component, link.end_component)
+        assert link.nodes == []
+    assert problem.constraint_service.is_feasible()
@@ -0,0 +1,58 @@
+from algorithms.greedy import GreedyHeuristic
+from core.problem import WriterService, ReaderService
+import pytest
+
+
+def baseline_output(problem):
+    grid = problem.grid
+
+    rows = []
+    for component in grid.components:
+        one_hot = [0] * len(grid.servers)
+        one_hot[component.server_id] = 1
+        rows.append('[{0}]'.format(','.join(map(str, one_hot))))
+
+    routes = []
+    for link_demand in grid.link_demands:
+        node_route = link_demand.link.nodes.__str__().replace(' ', '')
+        if node_route == '[]':
+            node_route = '[%d]' % (grid.get_component_node(link_demand.link.end_component).node_id + 1)
+        routes.append('<{0},{1},{2}>'.format(
+            link_demand.link.start_component.component_id + 1, link_demand.link.end_component.component_id + 1,
+            node_route
+        ))
+
+    return 'x={0};\n\nroutes={1};'.format('[\n{0}\n]'.format('\n'.join(rows)), '{\n' + ',\n'.join(routes) + ',\n}')
+
+
+@pytest.fixture
+def greedy(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+    return greedy
+
+
+@pytest.mark.parametrize('chunk_size', [4096, 7])
+def test_dense_output_matches_the_baseline_writer(problem, greedy, tmp_path, chunk_size):
+    file_path = str(tmp_path / 'solution.txt')
+    WriterService(problem, chunk_size=chunk_size).write(file_path)
+
+    with open(file_path) as output_file:
+        assert output_file.read() == baseline_output(problem)
+
+
+@pytest.mark.parametrize('sparse, compress', [(False, False), (True, False), (False, True), (True, True)])
+def test_written_solution_reads_back(problem, greedy, tmp_path, sparse, compress):
+    grid = problem.grid
+    cost, solution = problem.fitness(), grid.dump_solution()
+    file_path = str(tmp_path / 'solution.txt')
+    WriterService(problem, sparse=sparse, compress=compress, chunk_size=7).write(file_path)
+
+    with open(file_path, 'rb') as output_file:
+        assert (output_file.read(2) == b'\x1f\x8b') == compress
+    assert ReaderService(problem).read(file_path) == solution
+
+    grid.load_solution(*ReaderService(problem).read(file_path))
+    assert problem.fitness() == pytest.approx(cost)
+    assert grid.dump_solution() == solution
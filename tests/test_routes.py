@@ -0,0 +1,52 @@
+from core.routes import RouteCache, ResidualGraph
+import pytest
+
+
+def simple_paths(grid, start_node_id, end_node_id):
+    stack = [[start_node_id]]
+    while stack:
+        path = stack.pop()
+        for node in grid.nodes[path[-1]].adjacent_nodes:
+            if node.node_id == end_node_id:
+                yield path + [node.node_id]
+            elif node.node_id not in path:
+                stack.append(path + [node.node_id])
+
+
+@pytest.mark.parametrize('weight', RouteCache.weights)
+def test_k_shortest_paths_match_brute_force(problem, weight):
+    grid = problem.grid
+    route_cache = RouteCache(grid, k=10, weight=weight)
+
+    for start_node in grid.nodes:
+        for end_node in grid.nodes:
+            if start_node is end_node:
+                continue
+
+            paths = route_cache.k_shortest_paths(start_node.node_id, end_node.node_id)
+            all_paths = set(tuple(path) for path in simple_paths(grid, start_node.node_id, end_node.node_id))
+            best_costs = sorted(route_cache.route_cost(path) for path in all_paths)[:route_cache.k]
+
+            assert len(set(tuple(path) for path in paths)) == len(paths)
+            assert all(tuple(path) in all_paths for path in paths)
+            assert [route_cache.route_cost(path) for path in paths] == pytest.approx(best_costs)
+
+
+def test_route_that_does_not_fit_leaves_every_edge_unchanged(problem):
+    grid = problem.grid
+    route = next(route for route in grid.route_cache.get_routes(grid.nodes[0], grid.nodes[-1]) if len(route) > 2)
+    edges = grid.transform_node_route_to_edge_route(route)
+    assert ResidualGraph.reserve(edges[-1:], edges[-1].get_available_capacity() - 1)
+
+    capacity_used = [edge.capacity_used for edge in grid.edges]
+    link_demand = grid.link_demands[0]
+
+    assert not ResidualGraph.reserve(edges, 2)
+    assert not grid.try_add_link_route(link_demand.link, route, 2)
+    assert [edge.capacity_used for edge in grid.edges] == capacity_used
+    assert link_demand.link.nodes == [] and link_demand.link.edges == []
+
+    assert grid.try_add_link_route(link_demand.link, route, 1)
+    assert [edge.capacity_used - used for edge, used in zip(grid.edges, capacity_used)] == [
+        1 if edge in edges else 0 for edge in grid.edges
+    ]
@@ -0,0 +1,78 @@
+from algorithms.greedy import GreedyHeuristic
+from service import SolveService
+import service
+import asyncio
+import time
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTANCE = os.path.join(ROOT, 'data', 'instance.txt')
+
+
+class StallingSearch(GreedyHeuristic):
+    runs = 0
+
+    def deploy_routes(self):
+        super(StallingSearch, self).deploy_routes()
+        StallingSearch.runs += 1
+        if StallingSearch.runs > 1:
+            time.sleep(60)
+
+
+async def wait_finished(service, job):
+    outbox = asyncio.Queue()
+    service.subscribe(job.job_id, outbox)
+    while True:
+        event = await outbox.get()
+        if event['event'] == 'finished':
+            return event
+
+
+def run_jobs(requests, workers=1, grace_period=5.0, cancel_after=None):
+    async def run():
+        service = SolveService(workers=workers, grace_period=grace_period)
+        await service.start()
+        try:
+            jobs = [(await service.submit(path=INSTANCE, seed=0, **request))[0] for request in requests]
+            if cancel_after is not None:
+                await asyncio.sleep(cancel_after)
+                service.cancel(jobs[0].job_id)
+            return await asyncio.wait_for(asyncio.gather(*[wait_finished(service, job) for job in jobs]), 30)
+        finally:
+            await service.stop()
+
+    return asyncio.run(run())
+
+
+def test_time_limits_start_when_a_job_runs():
+    lns, greedy = run_jobs([
+        dict(algorithm='lns', time_limit=0.5), dict(algorithm='greedy', time_limit=1.0)
+    ])
+
+    for event in (lns, greedy):
+        assert event['state'] == 'done'
+        assert event['cost'] is not None and event['iterations'] > 0
+        assert event['solution'] is not None
+    assert lns['elapsed'] < 0.5 + 1.0
+
+
+def test_cancel_interrupts_a_running_search():
+    event, = run_jobs([dict(algorithm='annealing', time_limit=20.0)], cancel_after=1.0)
+
+    assert event['state'] == 'cancelled'
+    assert event['cost'] is not None
+    assert event['elapsed'] < 5.0
+
+
+def test_overrunning_worker_is_replaced_and_keeps_its_best_solution(monkeypatch):
+    monkeypatch.setitem(service.algorithms, 'stalling', StallingSearch)
+
+    stalled, greedy = run_jobs([
+        dict(algorithm='stalling', time_limit=0.5), dict(algorithm='greedy', time_limit=0.5)
+    ], grace_period=0.2)
+
+    assert stalled['state'] == 'timeout'
+    assert stalled['iterations'] == 1
+    assert stalled['cost'] is not None and stalled['solution'] is not None
+    assert stalled['elapsed'] < 5.0
+    assert greedy['state'] == 'done' and greedy['iterations'] > 0
@@ -0,0 +1,67 @@
+from core.tokenizer import Tokenizer
+from core.parser import Parser
+from utils.exceptions import ParseException
+import numpy as np
+import pytest
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse(tmp_path, text):
+    file_path = str(tmp_path / 'instance.txt')
+    with open(file_path, 'w') as instance_file:
+        instance_file.write(text)
+
+    parser = Parser(file_path)
+    parser.parse()
+    return parser.get_parsed_data()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('x = [1,2,3];', [1, 2, 3]),
+    ('x = [1,2,3,];', [1, 2, 3]),
+    ('x = [.5,-1e-3,+2];', [0.5, -0.001, 2]),
+    ('x = [1, /* two */ 2];', [1, 2]),
+    ('x = [[1,2]\n[3,4]];', [[1, 2], [3, 4]]),
+    ('x = [[1,2],\n[3,4,]];', [[1, 2], [3, 4]]),
+    ('Edges = {<1,2>,\n<3,4>,};', [[1, 2], [3, 4]]),
+    ('Edges = {<1,2>\n<3,4>};', [[1, 2], [3, 4]])
+])
+def test_well_formed_values(tmp_path, text, expected):
+    assert parse(tmp_path, text)[text.split()[0]].tolist() == expected
+
+
+@pytest.mark.parametrize('text, line, column', [
+    ('Edges = {<1,2-3>};', 1, 13),
+    ('x = [1-2];', 1, 6),
+    ('x = [1.5.5];', 1, 6),
+    ('x = [1 2 3];', 1, 7),
+    ('x = [1 /* two */ 2];', 1, 18),
+    ('x = [1,,2];', 1, 8),
+    ('x = 1-2;', 1, 5),
+    ('x = [[1 2]\n[3,4]];', 1, 7),
+    ('x = [[1,2]\n[3,4e]];', 2, 4),
+    ('Edges = {<1 2>};', 1, 11),
+    ('x = [1,2\n,3-4];', 2, 2)
+])
+def test_malformed_values_raise_parse_exception(tmp_path, text, line, column):
+    with pytest.raises(ParseException) as error:
+        parse(tmp_path, text)
+
+    assert (error.value.line, error.value.column) == (line, column)
+
+
+def test_small_chunks_parse_like_one_chunk(monkeypatch):
+    file_path = os.path.join(ROOT, 'data', 'instance.txt')
+    parser = Parser(file_path)
+    parser.parse()
+
+    monkeypatch.setattr(Tokenizer, 'chunk_size', 7)
+    chunked_parser = Parser(file_path)
+    chunked_parser.parse()
+
+    data, chunked_data = parser.get_parsed_data(), chunked_parser.get_parsed_data()
+    assert data.keys() == chunked_data.keys()
+    for var_name in data:
+        assert np.array_equal(data[var_name], chunked_data[var_name])
@@ -0,0 +1,74 @@
+from algorithms.greedy import GreedyHeuristic
+import pytest
+import random
+
+
+def snapshot(problem):
+    grid = problem.grid
+    return (
+        [component.server_id for component in grid.components],
+        [[node.node_id for node in link_demand.link.nodes] for link_demand in grid.link_demands],
+        [edge.capacity_used for edge in grid.edges],
+        [service_chain.get_delay() for service_chain in grid.service_chains],
+        problem.constraint_service.violation_count()
+    )
+
+
+def scramble(problem, moves):
+    grid = problem.grid
+
+    for _ in range(moves):
+        link_demand = random.choice(grid.link_demands)
+        if len(link_demand.link.nodes) > 0:
+            grid.remove_link_route(link_demand.link, link_demand.throughput)
+
+        component = random.choice(grid.components)
+        if component.is_deployed_on_server():
+            grid.servers[component.server_id].remove_component(component)
+        random.choice(grid.servers).add_component(component)
+
+    GreedyHeuristic(problem).route_demands(
+        [link_demand for link_demand in grid.link_demands if len(link_demand.link.nodes) == 0]
+    )
+
+
+def test_nested_rollback_restores_each_checkpoint(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+    grid = problem.grid
+
+    outer_state, outer_fitness = snapshot(problem), problem.fitness()
+    assert grid.checkpoint() == 1
+    scramble(problem, 20)
+
+    inner_state, inner_fitness = snapshot(problem), problem.fitness()
+    assert grid.checkpoint() == 2
+    scramble(problem, 20)
+
+    grid.rollback()
+    assert snapshot(problem) == inner_state
+    assert problem.fitness() == pytest.approx(inner_fitness)
+
+    grid.rollback()
+    assert snapshot(problem) == outer_state
+    assert problem.fitness() == pytest.approx(outer_fitness)
+
+
+def test_inner_commit_is_undone_by_outer_rollback(problem):
+    greedy = GreedyHeuristic(problem)
+    greedy.deploy_components()
+    greedy.deploy_routes()
+    grid = problem.grid
+
+    state, fitness = snapshot(problem), problem.fitness()
+    grid.checkpoint()
+    scramble(problem, 10)
+    grid.checkpoint()
+    scramble(problem, 10)
+    grid.commit()
+
+    grid.rollback()
+    assert snapshot(problem) == state
+    assert problem.fitness() == pytest.approx(fitness)
+    assert len(grid.change_log.entries) == 0
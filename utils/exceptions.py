@@ -1,3 +1,11 @@
 
 class OutOfCapacityException(Exception):
     pass
+
+
+class ParseException(Exception):
+
+    def __init__(self, message, line, column):
+        super(ParseException, self).__init__('{0} (line {1}, column {2})'.format(message, line, column))
+        self.line = line
+        self.column = column
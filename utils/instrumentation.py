@@ -0,0 +1,205 @@
+from collections import defaultdict
+import tracemalloc
+import functools
+import cProfile
+import logging
+import pstats
+import math
+import time
+import io
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram(object):
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = defaultdict(int)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        self.buckets[self.__bucket(seconds)] += 1
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] += count
+
+    def mean(self):
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, percent):
+        assert 0 <= percent <= 100, 'Percentile should be between 0 and 100.'
+        if self.count == 0:
+            return 0.0
+
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= percent / 100.0 * self.count:
+                return min(self.max, 2 ** bucket * 1e-6)
+
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean(),
+            'min': self.min,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets_us': {2 ** bucket: count for bucket, count in sorted(self.buckets.items())}
+        }
+
+    def __bucket(self, seconds):
+        microseconds = seconds * 1e6
+        return max(0, int(math.ceil(math.log2(microseconds)))) if microseconds > 1 else 0
+
+
+class ProfileData(object):
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class Instrumentation(object):
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.counters = defaultdict(int)
+        self.histograms = defaultdict(Histogram)
+        self.profiler = None
+        self.profile_stats = None
+        self.memory_statistics = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def record(self, name, seconds):
+        self.histograms[name].add(seconds)
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def snapshot(self):
+        return dict(self.counters), dict(self.histograms)
+
+    def merge(self, counters, histograms):
+        for name, value in counters.items():
+            self.counters[name] += value
+        for name, histogram in histograms.items():
+            self.histograms[name].merge(histogram)
+
+    def start_capture(self, cpu=True, memory=False):
+        if cpu:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if memory:
+            tracemalloc.start()
+
+    def stop_capture(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profile_stats = pstats.Stats(self.profiler)
+            self.profiler = None
+        if tracemalloc.is_tracing():
+            self.memory_statistics = tracemalloc.take_snapshot().statistics('lineno')
+            tracemalloc.stop()
+
+    def capture_snapshot(self):
+        profile = self.profile_stats.stats if self.profile_stats is not None else None
+        return profile, self.memory_statistics
+
+    def merge_capture(self, profile, memory):
+        if profile is not None:
+            stats = pstats.Stats(ProfileData(profile))
+            if self.profile_stats is None:
+                self.profile_stats = stats
+            else:
+                self.profile_stats.add(stats)
+
+        if memory is not None:
+            statistics = {statistic.traceback: statistic for statistic in self.memory_statistics or []}
+            for statistic in memory:
+                known = statistics.get(statistic.traceback)
+                if known is not None:
+                    statistic = tracemalloc.Statistic(
+                        statistic.traceback, known.size + statistic.size, known.count + statistic.count
+                    )
+                statistics[statistic.traceback] = statistic
+            self.memory_statistics = sorted(statistics.values(), key=lambda x: (x.size, x.count), reverse=True)
+
+    def report(self, top=10):
+        report = {
+            'timers': {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+            'counters': dict(sorted(self.counters.items()))
+        }
+
+        if self.profile_stats is not None:
+            output = io.StringIO()
+            self.profile_stats.stream = output
+            self.profile_stats.sort_stats('cumulative').print_stats(top)
+            report['profile'] = output.getvalue()
+
+        if self.memory_statistics is not None:
+            report['memory'] = [str(stat) for stat in self.memory_statistics[:top]]
+
+        return report
+
+    def log_report(self, level=logging.INFO, top=10):
+        report = self.report(top)
+
+        for name, summary in report['timers'].items():
+            logger.log(level, '%-32s n=%-8d total=%.6fs mean=%.6fs p99=%.6fs', name, summary['count'],
+                       summary['total'], summary['mean'], summary['p99'])
+        for name, value in report['counters'].items():
+            logger.log(level, '%-32s %d', name, value)
+        if 'profile' in report:
+            logger.log(level, '%s', report['profile'])
+        for line in report.get('memory', []):
+            logger.log(level, '%s', line)
+
+
+instrumentation = Instrumentation()
+
+
+def timed(name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                instrumentation.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator